@@ -0,0 +1,103 @@
+"""
+This script measures how long it takes to import the tessy package in a fresh
+interpreter, and how long its first use takes (which loads the module itself).
+
+The median of several runs is compared to a time budget, the script exits with a
+non-zero status if any budget is exceeded or if a heavy module has been loaded
+eagerly.
+
+Usage: python bench-import.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+
+
+Config = type(
+    "Config",
+    (object,),
+    {
+        "RUNS": 15,
+        # Budgets in milliseconds
+        "IMPORT_BUDGET": 10.0,
+        "FIRST_USE_BUDGET": 80.0,
+        # Modules which must not be loaded by 'import tessy' followed by a first use
+        "LAZY_MODULES": [
+            "asyncio",
+            "concurrent.futures",
+            "ctypes",
+            "distutils",
+            "hashlib",
+            "json",
+            "subprocess",
+            "tempfile",
+            "xmltodict",
+        ],
+    },
+)
+
+PROBE_CODE = """
+import sys, time
+t0 = time.perf_counter()
+import tessy
+t1 = time.perf_counter()
+tessy.Lang
+t2 = time.perf_counter()
+lazy = {lazy_modules!r}
+print((t1 - t0) * 1000, (t2 - t1) * 1000, *[m for m in lazy if m in sys.modules])
+"""
+
+
+def run_probe():
+    code = PROBE_CODE.format(lazy_modules=Config.LAZY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    values = output.split()
+
+    return float(values[0]), float(values[1]), values[2:]
+
+
+def bench(runs):
+    import_times, first_use_times, loaded = [], [], set()
+
+    for _ in range(runs):
+        import_time, first_use_time, modules = run_probe()
+        import_times.append(import_time)
+        first_use_times.append(first_use_time)
+        loaded.update(modules)
+
+    return (
+        statistics.median(import_times),
+        statistics.median(first_use_times),
+        sorted(loaded),
+    )
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else Config.RUNS
+    import_time, first_use_time, loaded = bench(runs)
+    failed = False
+
+    print(
+        "import tessy: {0:.2f} ms (budget: {1:.2f} ms)".format(
+            import_time, Config.IMPORT_BUDGET
+        )
+    )
+    print(
+        "first use:    {0:.2f} ms (budget: {1:.2f} ms)".format(
+            first_use_time, Config.FIRST_USE_BUDGET
+        )
+    )
+
+    if import_time > Config.IMPORT_BUDGET or first_use_time > Config.FIRST_USE_BUDGET:
+        print("Time budget exceeded.")
+        failed = True
+
+    if loaded:
+        print("Eagerly loaded module(s): {0}".format(", ".join(loaded)))
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
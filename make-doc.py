@@ -128,7 +128,8 @@ def format_doc(text, **kw):
 
 def get_members_info(obj):
     result = []
-    attrs = obj.__dict__.keys()
+    # Lazily loaded modules list their members in __all__
+    attrs = getattr(obj, "__all__", obj.__dict__.keys())
 
     for attr_name in attrs:
         if attr_name.startswith("_") or attr_name in Config.IGNORED_MEMBERS:
@@ -15,16 +15,36 @@ an optical character recognition engine used to *detect and extract* text data f
 - No initial dependencies beside [Tesseract](https://github.com/tesseract-ocr/tesseract).
 - Supports input image in `PNG`, `JPG`, `JPEG`, `GIF`, `TIF` and `BMP` format.
 - Supports multiple input images via text file *(.txt)*.
+- Supports encoded image data as `bytes`, `memoryview` or binary file-like object.
 - Supports image objects from: 
   * [Pillow](https://github.com/python-pillow/Pillow) *(Image)*
   * [wxPython](https://github.com/wxWidgets/wxPython) *(wx.Image)*
   * [PyQt4](https://www.riverbankcomputing.com/software/pyqt/download)/
     [PyQt5](https://www.riverbankcomputing.com/software/pyqt/download5)/
     [PySide](https://github.com/pyside/pyside-setup) *(QImage)*
-  * [OpenCV](https://github.com/skvark/opencv-python) *(ndarray)*
+  * [OpenCV](https://github.com/skvark/opencv-python)/[NumPy](https://numpy.org) *(ndarray)*
+- Probes Tesseract once per binary and keeps its capabilities in a cache file.
+- Rejects languages which aren't installed before starting Tesseract.
 - Dynamically detect and import the corresponding image module on runtime.
+- Can prepare an image once and reuse it for several OCR passes.
 - Supports `txt`, `box`, `pdf`, `hocr`, `tsv` and `osd` as output file format.
 - Supports multiple output format.
+- Provides `asyncio` coroutine versions of the `image_to_*` functions.
+- Supports batch processing of multiple images over a thread or process pool.
+- Can run Tesseract in-process through `libtesseract` *(optional)*.
+- Supports per-call timeouts and deadlines which kill the Tesseract process.
+- Can cache the results in memory by image content and OCR parameters *(opt-in)*.
+- Can cache the results on disk, shared by several processes and kept between runs *(opt-in)*.
+- Can share a single processing between identical concurrent calls *(opt-in)*.
+- Provides thread-safe sessions, each with its own configuration and temporary files.
+- Keeps its temporary files in a private directory, in memory (`/dev/shm`) when there is room.
+- Hands image objects to Tesseract as raw PGM/PPM images, straight from their pixel memory.
+- Can preprocess the images with `NumPy` (blank page detection, cropping to the content, grayscale, binarization, OSD-driven orientation, deskew, despeckle, rescaling to the optimal text size) *(optional)*.
+- Maps the box, TSV and hOCR coordinates of preprocessed images back to the original images.
+- Fast to import, the heavy modules are only loaded on first use.
+- Can keep warm Tesseract processes on standby to skip the language data loading.
+- Can warm the language data files up ahead of the first OCR call and report how long it took.
+- Can process a group of images with a single Tesseract process and split the result per image.
 - Can convert any raw output data to `string`, `bytes` or `dict` *(except pdf)*.
 - Works on macOS, Linux and Windows.
 - Well [documented](@@#api).
@@ -106,32 +126,86 @@ print(text)
 
 Check out the __[examples](examples/README.md)__ for more advanced usages and the __[documentation](@@#api)__ to see what features are available.
 """
-from ._tessy import (
-    Lang,
-    DataOutput,
-    command,
-    set_command,
-    data_dir,
-    set_data_dir,
-    content_sep,
-    set_content_sep,
-    configure,
-    init,
-    image_to_file,
-    image_to_data,
-    image_to_string,
-    locate,
-    locate_data,
-    run,
-    runnable,
-    start,
-    tesseract_version,
-    clear_cache,
-    clear_temp,
-    sv_to_dict,
-    boxes_to_dict,
-    hocr_to_dict,
-    osd_to_dict,
-)
-
-VERSION = "0.5.2"
\ No newline at end of file
+# Public members of the '_tessy' module, which only gets imported on first access to
+# one of them to keep 'import tessy' fast
+_members = [
+    "Lang",
+    "DataOutput",
+    "Pool",
+    "Backend",
+    "PreparedImage",
+    "Tessy",
+    "Version",
+    "Status",
+    "Preprocess",
+    "TessyWarning",
+    "TessyTimeoutWarning",
+    "command",
+    "set_command",
+    "data_dir",
+    "set_data_dir",
+    "content_sep",
+    "set_content_sep",
+    "backend",
+    "set_backend",
+    "default_timeout",
+    "set_default_timeout",
+    "set_result_cache",
+    "result_cache_info",
+    "set_disk_cache",
+    "disk_cache_info",
+    "preprocess_info",
+    "coalescing",
+    "set_coalescing",
+    "temp_dir",
+    "set_temp_dir",
+    "configure",
+    "init",
+    "warm_up",
+    "prepare_image",
+    "image_to_file",
+    "image_to_data",
+    "image_to_string",
+    "image_to_file_async",
+    "image_to_data_async",
+    "image_to_string_async",
+    "image_to_data_many",
+    "image_to_string_many",
+    "locate",
+    "locate_data",
+    "run",
+    "runnable",
+    "start",
+    "tesseract_version",
+    "tesseract_info",
+    "installed_langs",
+    "lang_installed",
+    "clear_cache",
+    "clear_temp",
+    "standby",
+    "clear_standby",
+    "clear_result_cache",
+    "clear_disk_cache",
+    "sv_to_dict",
+    "boxes_to_dict",
+    "hocr_to_dict",
+    "osd_to_dict",
+]
+
+__all__ = [*_members, "VERSION"]
+
+VERSION = "0.5.2"
+
+
+def __getattr__(name):
+    if name in _members:
+        from . import _tessy
+
+        globals().update((member, getattr(_tessy, member)) for member in _members)
+        return globals()[name]
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_members))
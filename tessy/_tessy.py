@@ -1,30 +1,64 @@
-import glob
+import atexit
+import collections
+import contextvars
+import functools
 import importlib
-import ntpath
+import importlib.util
+import io
+import itertools
+import math
 import os
-import platform
-import shlex
-import shutil
+import re
+import signal
 import string
-import subprocess
 import sys
-import tempfile
+import threading
+import time
 import warnings
+import zlib
 
 try:
     import winreg
 except ImportError:
     pass
 
-from distutils.version import LooseVersion
 from enum import Enum
-from pathlib import Path
 
-XMLTODICT_INSTALLED = importlib.util.find_spec("xmltodict") is not None
 
-if XMLTODICT_INSTALLED:
-    import json
-    import xmltodict
+class _TessyLazyModule(object):
+    """
+    Stands for a module (and the given submodules) imported on first attribute 
+    access, the global name is then bound to the actual module.
+    """
+
+    def __init__(self, name, *submodules):
+        self._name = name
+        self._submodules = submodules
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+
+        for submodule in self._submodules:
+            importlib.import_module("{0}.{1}".format(self._name, submodule))
+
+        globals()[self._name] = module
+        return getattr(module, attr)
+
+
+# Modules only needed by some of the functions are imported on first use
+asyncio = _TessyLazyModule("asyncio")
+base64 = _TessyLazyModule("base64")
+concurrent = _TessyLazyModule("concurrent", "futures")
+copy = _TessyLazyModule("copy")
+ctypes = _TessyLazyModule("ctypes", "util")
+glob = _TessyLazyModule("glob")
+hashlib = _TessyLazyModule("hashlib")
+json = _TessyLazyModule("json")
+shlex = _TessyLazyModule("shlex")
+shutil = _TessyLazyModule("shutil")
+subprocess = _TessyLazyModule("subprocess")
+tempfile = _TessyLazyModule("tempfile")
+xmltodict = _TessyLazyModule("xmltodict")
 
 
 # -------------------------------------------------------------------
@@ -163,7 +197,7 @@ class TessyLang(Enum):
         """
         Returns `True` if the given value equals any existing language value.
         """
-        return any(value == item.value for item in cls)
+        return value in cls._value2member_map_
 
     @classmethod
     def join(cls, *args):
@@ -223,17 +257,242 @@ class TessyLang(Enum):
 # -------------------------------------------------------------------
 TessyWarning = type("TessyWarning", (Warning,), {})
 
+TessyTimeoutWarning = type(
+    "TessyTimeoutWarning",
+    (TessyWarning,),
+    {"__doc__": """ 
+    Warning category used when a `Tesseract` process has been killed because its 
+    timeout <or> deadline expired.
+
+    Can be turned into an exception using the `warnings` module:
+    ```python
+    warnings.simplefilter("error", tessy.TessyTimeoutWarning)
+    ```
+    """},
+)
+
+
+# -------------------------------------------------------------------
+# TessyPreparedImage
+# -------------------------------------------------------------------
+class TessyPreparedImage(object):
+    """
+    `TessyPreparedImage` holds an image prepared once by the 
+    __[prepare_image](@@$prepare_image)__ function, which can be given as __`image`__
+    to any number of `image_to_*` calls.
+
+    This class can only be accessed through the `tessy.PreparedImage` variable.
+    """
+
+    def __init__(self, source):
+        # Image path <or> encoded image data
+        self._source = source
+        # Image content hash used by the result caches, computed once
+        self._digest = None
+
+    def close(self):
+        """
+        Releases the prepared image data. The image can't be used anymore.
+        """
+        self._source = None
+
+    @property
+    def closed(self):
+        """
+        Equals `True` if the prepared image has been released.
+        """
+        return self._source is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# -------------------------------------------------------------------
+# TessyVersion
+# -------------------------------------------------------------------
+@functools.total_ordering
+class TessyVersion(object):
+    """ 
+    `TessyVersion` holds a version number, such as `"5.3.0"` or `"4.1.1-rc2"`, which 
+    can be compared to another version or to a version string.
+
+    Numeric components are compared as numbers, others as strings.
+
+    This class can only be accessed through the `tessy.Version` variable.
+    """
+
+    def __init__(self, vstring):
+        self.vstring = vstring
+        self.version = [
+            int(component) if component.isdigit() else component
+            for component in re.findall(r"\d+|[a-z]+", vstring.lower())
+        ]
+
+    def _key(self):
+        """
+        Comparison key: strings sort before numbers, so that types never meet.
+        """
+        return [(isinstance(c, int), c) for c in self.version]
+
+    def __eq__(self, other):
+        if isinstance(other, str):
+            other = TessyVersion(other)
+        elif not isinstance(other, TessyVersion):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __lt__(self, other):
+        if isinstance(other, str):
+            other = TessyVersion(other)
+        elif not isinstance(other, TessyVersion):
+            return NotImplemented
+
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash(tuple(self._key()))
+
+    def __str__(self):
+        return self.vstring
+
+    def __repr__(self):
+        return "TessyVersion('{0}')".format(self.vstring)
+
+
+# -------------------------------------------------------------------
+# TessySession
+# -------------------------------------------------------------------
+class TessySession(object):
+    """ 
+    `TessySession` holds its own configuration (command, data directory, timeout, 
+    caches, ...) and temporary files registry, initialized from a copy of the module 
+    configuration.
+
+    A session exposes the configuration and `image_to_*` functions of the module as 
+    methods, which only read and update the session configuration. The data 
+    directory is given to `Tesseract` using the `--tessdata-dir` parameter instead 
+    of the environment, so sessions using different data directories can be used 
+    concurrently.
+
+    A session can be shared across threads and `asyncio` tasks and is still usable 
+    in a child process after a `fork`.
+
+    > __`options`__ holds the configuration options to apply to the session.
+    >
+    > See __[configure](@@$configure)__ documentation for more details.
+
+    This class can only be accessed through the `tessy.Tessy` variable.
+    """
+
+    def __init__(self, **options):
+        self._config = type(
+            "TessyConfig",
+            (object,),
+            {
+                name: value
+                for name, value in vars(_config_var.get()).items()
+                if not name.startswith("__")
+            },
+        )
+        self._config.tempfiles = []
+        self._config.tempdir = None
+
+        if options:
+            self.configure(**options)
+
+    def close(self):
+        """
+        Removes the temporary directory of the session and every file it holds.
+
+        The session remains usable, a new temporary directory is created on demand.
+        """
+        self._call(_remove_temp_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _call(self, func, *args, **kwargs):
+        """
+        Calls the given module function using the session configuration.
+        """
+        token = _config_var.set(self._config)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _config_var.reset(token)
+
+    async def _call_async(self, func, *args, **kwargs):
+        """
+        Awaits the given module coroutine function using the session configuration.
+        """
+        token = _config_var.set(self._config)
+
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _config_var.reset(token)
+
+
+class _TessyConfigProxy(object):
+    """
+    Forwards the configuration attributes to the configuration of the session active 
+    in the current context, or to the module configuration.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(_config_var.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(_config_var.get(), name, value)
+
 
 # -------------------------------------------------------------------
 # Tessy
 # -------------------------------------------------------------------
 Lang = TessyLang
 
+PreparedImage = TessyPreparedImage
+
+Tessy = TessySession
+
+Version = TessyVersion
+
 DataOutput = type(
     "TessyDataOutput", (object,), {"BYTES": "bytes", "STRING": "str", "DICT": "dict"}
 )
 
-_config = type(
+Pool = type("TessyPool", (object,), {"THREAD": "thread", "PROCESS": "process"})
+
+Backend = type("TessyBackend", (object,), {"CLI": "cli", "LIB": "lib"})
+
+Status = type("TessyStatus", (object,), {"ERROR": -1, "TIMEOUT": -2})
+
+Preprocess = type(
+    "TessyPreprocess",
+    (object,),
+    {
+        "GRAY": "gray",
+        "OTSU": "otsu",
+        "SAUVOLA": "sauvola",
+        "DESKEW": "deskew",
+        "DESPECKLE": "despeckle",
+        "SCALE": "scale",
+        "ORIENT": "orient",
+        "CROP": "crop",
+    },
+)
+
+_module_config = type(
     "TessyConfig",
     (object,),
     {
@@ -243,21 +502,148 @@ _config = type(
         "datadir": None,
         # Content separator used when multiple file content are merged into a single string
         "contentsep": "||||",
+        # OCR backend: Tesseract command (cli) <or> in-process libtesseract (lib)
+        "backend": Backend.CLI,
+        # libtesseract library path <or> name, None to search it in the system paths
+        "libpath": None,
+        # Default timeout of each Tesseract call in seconds, None for no timeout
+        "timeout": None,
+        # Maximum number of entries <and> bytes of the result cache, 0 to disable it
+        "cacheentries": 0,
+        "cachebytes": 0,
+        # Disk cache directory (absolute), None to disable it
+        "diskcache": None,
+        # Maximum total size (in bytes) and age (in seconds) of the disk cache entries
+        "diskcachebytes": 0,
+        "diskcacheage": None,
+        # Equals True if identical concurrent calls share a single processing
+        "coalescing": False,
         # Cache file which contain the Tesseract binary path (absolute)
         "pathfile": ".TESSPATH",
+        # Cache file which contain the capabilities of each probed Tesseract binary
+        "probefile": ".TESSPROBE",
         # Windows Tesseract registry key path (HKEY_LOCAL_MACHINE)
         "winregkey": "SOFTWARE\\Tesseract-OCR",
+        # List of temporary files created by the 'image_to_file' functions
+        "tempfiles": [],
+        # Directory (absolute) in which the temporary directory gets created, None to
+        # use /dev/shm if it has enough free space <or> the system temporary directory
+        "tempbase": None,
+        # Maximum total size (in bytes) of the 'tempfiles' list files, 0 for no limit
+        "tempbytes": 512 * 1024 * 1024,
+        # Temporary directory (absolute) of the module, created on first use
+        "tempdir": None,
     },
 )
 
-# List of temporary files created by the module
-_tempfiles = []
+# Configuration of the session active in the current context (see 'TessySession')
+_config_var = contextvars.ContextVar("tessy_config", default=_module_config)
+
+# Configuration of the session active in the current context
+_config = _TessyConfigProxy()
+
+# Random prefix of the temporary names created by the current process
+_temp_prefix = "TESS_{0}_".format(os.urandom(6).hex())
+
+# Counter of the temporary names created by the current process
+_temp_counter = itertools.count()
+
+# Temporary directories created by the current process
+_temp_dirs = set()
+
+# Temporary files waiting to be removed by the cleanup thread
+_temp_trash = []
+
+# Configurations whose temporary files size must be checked by the cleanup thread
+_temp_checks = []
+
+# Condition guarding the temporary directories, files lists and the cleanup thread
+_temp_cond = threading.Condition()
+
+# Cleanup thread of the temporary files, started on first use
+_temp_thread = None
+
+# Tiny blank image (binary PGM) processed by 'warm_up'
+_warm_up_image = b"P5 32 32 255\n" + b"\xff" * 32 * 32
 
 # Supported image modules holder
 _image_modules = {"pil": None, "wx": None, "qt": None, "cv": None}
 
 # Equals True if the system's OS is a Windows-based OS
-_platform_windows = platform.system().lower() == "windows"
+_platform_windows = os.name == "nt"
+
+# Per-thread warning messages recorder (used by the batch functions)
+_warn_records = threading.local()
+
+# Equals True once the current batch worker process has been initialized
+_batch_initialized = False
+
+# Loaded libtesseract/Leptonica libraries (see '_load_lib')
+_lib = {}
+
+# Per-thread libtesseract engine handles, by (datadir, lang, oem, config)
+_lib_local = threading.local()
+
+# Lock guarding the libraries loading
+_lib_lock = threading.Lock()
+
+# In-memory results (LRU order) and their size in bytes, by cache key
+_result_cache = collections.OrderedDict()
+
+# Result cache counters
+_result_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+# Lock guarding the result cache
+_result_cache_lock = threading.Lock()
+
+# Disk cache counters, 'pending' holds the bytes written since the last pruning
+_disk_cache_stats = {"hits": 0, "misses": 0, "writes": 0, "pending": 0}
+
+# Lock guarding the disk cache counters
+_disk_cache_lock = threading.Lock()
+
+# Lock held while the disk cache gets pruned
+_disk_cache_prune_lock = threading.Lock()
+
+# Preprocessing counters and time spent (in seconds) by each step
+_preprocess_stats = {
+    "images": 0,
+    "blank": 0,
+    "elapsed": 0.0,
+    "input_bytes": 0,
+    "output_bytes": 0,
+    "steps": {},
+}
+
+# Lock guarding the preprocessing counters and the orientation cache
+_preprocess_lock = threading.Lock()
+
+# Clockwise rotation (in degrees) found by the OSD pass (LRU order), by pixels digest
+_orient_cache = collections.OrderedDict()
+
+# Future of each in-progress coalesced call, by cache key (see '_coalesce')
+_inflight = {}
+
+# Lock guarding the in-progress coalesced calls
+_inflight_lock = threading.Lock()
+
+# Capabilities of each probed Tesseract binary, by path (see '_get_probe')
+_probes = {}
+
+# Lock guarding the probes and the probe file
+_probe_lock = threading.Lock()
+
+# Installed languages (None if unknown), by data directory (see '_get_installed_langs')
+_lang_registry = {}
+
+# Standby Tesseract processes waiting on stdin, by arguments tuple
+_standby_procs = {}
+
+# Number of standby processes to keep started, by arguments tuple
+_standby_counts = {}
+
+# Lock guarding both standby dictionaries
+_standby_lock = threading.Lock()
 
 
 def command():
@@ -313,11 +699,13 @@ def set_data_dir(datadir, update_env=True):
 
     > If __`update_env`__ is set to `True`, the `TESSDATA_PREFIX` environment variable
     > will be set using __`datadir`__'s value.
+    >
+    > The environment is never updated by a __[TessySession](@@$Tessy)__.
     """
     if os.path.isdir(datadir):
         _config.datadir = datadir
 
-        if update_env:
+        if update_env and _config_var.get() is _module_config:
             os.environ["TESSDATA_PREFIX"] = _config.datadir
     else:
         _warn("set_data_dir: Invalid directory: '{0}'".format(datadir))
@@ -346,12 +734,326 @@ def set_content_sep(sep):
         _warn("set_content_sep: Invalid separator: {0}".format(sep))
 
 
+def backend():
+    """ 
+    Returns the OCR backend used by the __[image_to_data](@@$image_to_data)__ and
+    __[image_to_string](@@$image_to_string)__ functions.
+
+    *Supported values*: `Backend.CLI`, `Backend.LIB`
+
+    *Default:* `Backend.CLI`
+    """
+    return _config.backend
+
+
+def set_backend(name, lib_path=None):
+    """ 
+    Sets the OCR backend.
+
+    > `Backend.CLI` starts a new `Tesseract` process for each call.
+
+    > `Backend.LIB` loads `libtesseract` in the current process through `ctypes` and
+    > keeps one engine instance alive per thread, language(s) and configuration, so 
+    > the language data is only loaded once. Images are passed to the engine straight
+    > from the Pillow, wxPython, QImage and NumPy/OpenCV image memory. Other images 
+    > (paths, image data) are decoded by `Leptonica`.
+    >
+    > Calls that can't be processed in-process (*e.g.*: `osd` output format or 
+    > unsupported `config` parameters) fall back to the `Tesseract` command.
+    > 
+    > __*Note*: `image_to_file` always uses the `Tesseract` command__.
+
+    > __`lib_path`__ holds the path <or> the name of the `libtesseract` library. If 
+    > set to `None`, the library is searched in the system paths and in the 
+    > `Tesseract` command directory.
+
+    If the library can't be loaded, the backend stays unchanged.
+    """
+    if name == Backend.CLI:
+        _config.backend = name
+    elif name == Backend.LIB:
+        if lib_path:
+            _config.libpath = lib_path
+            _lib.clear()
+
+        if _load_lib():
+            _config.backend = name
+        else:
+            _warn(
+                "set_backend: Unable to load the libtesseract library, "
+                "the '{0}' backend will be used.".format(_config.backend)
+            )
+    else:
+        _warn("set_backend: Invalid backend: {0}".format(name))
+
+
+def default_timeout():
+    """ 
+    Returns the default timeout (in seconds) applied to each `Tesseract` call, `None`
+    if there's none.
+    """
+    return _config.timeout
+
+
+def set_default_timeout(seconds):
+    """ 
+    Sets the default timeout (in seconds) applied to each `Tesseract` call which 
+    doesn't specify its own __`timeout`__ <or> __`deadline`__.
+
+    > If __`seconds`__ is set to `None`, `Tesseract` calls never time out.
+    """
+    if seconds is None or (
+        isinstance(seconds, (int, float))
+        and not isinstance(seconds, bool)
+        and seconds > 0
+    ):
+        _config.timeout = seconds
+    else:
+        _warn("set_default_timeout: Invalid timeout: {0}".format(seconds))
+
+
+def set_result_cache(max_entries=256, max_bytes=64 * 1024 * 1024):
+    """ 
+    Enables the in-memory result cache of the __[image_to_data](@@$image_to_data)__ 
+    and __[image_to_string](@@$image_to_string)__ functions (including their `async`
+    and batch versions).
+
+    Results are stored by image content (file content, encoded data or raw pixels), 
+    output format(s), data output, language(s), configuration and `Tesseract` 
+    version, so a repeated call returns without starting `Tesseract` at all.
+
+    > __`max_entries`__ holds the maximum number of cached results.
+
+    > __`max_bytes`__ holds the maximum total size of the cached results, in bytes.
+
+    The least recently used results are evicted once any limit is reached.
+
+    If __`max_entries`__ <or> __`max_bytes`__ is set to `0`, the cache is disabled 
+    and cleared.
+
+    *Note*: Text files containing multiple image paths are never cached.
+    """
+    if not all(
+        isinstance(value, int) and not isinstance(value, bool) and value >= 0
+        for value in (max_entries, max_bytes)
+    ):
+        _warn(
+            "set_result_cache: Invalid limits: {0}, {1}".format(max_entries, max_bytes)
+        )
+        return
+
+    if not max_entries or not max_bytes:
+        max_entries = max_bytes = 0
+
+    _config.cacheentries, _config.cachebytes = max_entries, max_bytes
+    _result_cache_evict()
+
+
+def result_cache_info():
+    """ 
+    Returns the result cache counters and limits as a `dict`.
+
+    *Returned keys*: `hits`, `misses`, `evictions`, `entries`, `bytes`, `max_entries`,
+    `max_bytes`
+    """
+    with _result_cache_lock:
+        result = dict(_result_cache_stats)
+        result["entries"] = len(_result_cache)
+
+    result["max_entries"] = _config.cacheentries
+    result["max_bytes"] = _config.cachebytes
+
+    return result
+
+
+def set_disk_cache(path, max_bytes=1024 * 1024 * 1024, max_age=None):
+    """ 
+    Enables the persistent result cache of the __[image_to_file](@@$image_to_file)__, 
+    __[image_to_data](@@$image_to_data)__ and __[image_to_string](@@$image_to_string)__
+    functions (including their `async` and batch versions).
+
+    Results are stored compressed under __`path`__, by image content, output 
+    format(s), data output, language(s), configuration, `Tesseract` version and 
+    language data files, so the cache can be shared by several processes and kept 
+    between runs. Entries are written atomically and become unreachable as soon as 
+    `Tesseract` or its language data is updated.
+
+    > __`path`__ holds the cache directory, created if needed. If __`path`__ is set to 
+    > `None`, the disk cache is disabled.
+
+    > __`max_bytes`__ holds the maximum total size of the cache entries, in bytes.
+    > The least recently used entries are removed in the background once it's 
+    > exceeded.
+
+    > __`max_age`__ holds the maximum age of an unused entry, in seconds. If 
+    > __`max_age`__ is set to `None`, entries never expire.
+
+    Returns `True` if the disk cache has been set.
+
+    *Note*: Text files containing multiple image paths are never cached.
+    """
+    if path is None:
+        _config.diskcache = None
+        return True
+
+    if not isinstance(max_bytes, int) or max_bytes <= 0:
+        _warn("set_disk_cache: Invalid size: {0}".format(max_bytes))
+        return False
+
+    if max_age is not None and (not isinstance(max_age, (int, float)) or max_age <= 0):
+        _warn("set_disk_cache: Invalid age: {0}".format(max_age))
+        return False
+
+    path = os.path.abspath(path)
+
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        _warn(
+            "set_disk_cache: Could not create the directory: '{0}'.\n"
+            "OS Error ({1}): {2}.".format(path, e.errno, e.strerror)
+        )
+        return False
+
+    _config.diskcache = path
+    _config.diskcachebytes, _config.diskcacheage = max_bytes, max_age
+
+    threading.Thread(
+        target=contextvars.copy_context().run, args=(_disk_cache_prune,), daemon=True
+    ).start()
+
+    return True
+
+
+def disk_cache_info():
+    """ 
+    Returns the disk cache counters of the current process and its settings as a
+    `dict`.
+
+    *Returned keys*: `hits`, `misses`, `writes`, `path`, `max_bytes`, `max_age`
+    """
+    with _disk_cache_lock:
+        result = {key: _disk_cache_stats[key] for key in ("hits", "misses", "writes")}
+
+    result["path"] = _config.diskcache
+    result["max_bytes"] = _config.diskcachebytes
+    result["max_age"] = _config.diskcacheage
+
+    return result
+
+
+def preprocess_info():
+    """ 
+    Returns the preprocessing counters of the current process as a `dict`: the
+    number of preprocessed images, the number of blank pages among them (which
+    weren't handed to `Tesseract`), the total time spent preprocessing them (in
+    seconds), the size of their pixels before and after preprocessing (in bytes) and
+    the time spent by each step.
+
+    *Returned keys*: `images`, `blank`, `elapsed`, `input_bytes`, `output_bytes`,
+    `steps`
+
+    *Example*:
+    ```python
+    {
+        "images": 2,
+        "blank": 0,
+        "elapsed": 0.084,
+        "input_bytes": 17418240,
+        "output_bytes": 725760,
+        "steps": {"decode": 0.021, "gray": 0.012, "deskew": 0.031, "otsu": 0.008},
+    }
+    ```
+
+    See the __`preprocess`__ parameter of the __[image_to_file](@@$image_to_file)__
+    function.
+    """ 
+    with _preprocess_lock:
+        result = dict(_preprocess_stats)
+        result["steps"] = dict(_preprocess_stats["steps"])
+
+    return result
+
+
+def temp_dir():
+    """ 
+    Returns the directory holding the temporary files, created on first use.
+    """
+    return _get_session_temp_dir()
+
+
+def set_temp_dir(path=None, max_bytes=512 * 1024 * 1024):
+    """ 
+    Sets the directory in which the temporary directory is created and the size 
+    limit of the temporary files kept for the caller.
+
+    The module and each __[TessySession](@@$Tessy)__ store their temporary 
+    files in their own directory, created on first use and removed once the process 
+    exits. Temporary files which are no longer needed are removed by a background 
+    thread.
+
+    > `path` must be an absolute path. If set to `None`, `/dev/shm` is used when it 
+    > has enough free space, otherwise the system temporary directory.
+
+    > __`max_bytes`__ holds the maximum total size of the files returned by the 
+    > __[image_to_file](@@$image_to_file)__ functions which haven't been removed yet. 
+    > Once exceeded, the oldest ones are removed in the background.
+    >
+    > `0` for no limit.
+
+    Returns `True` if the settings have been applied.
+    """
+    if path is not None and not os.path.isdir(path):
+        _warn("set_temp_dir: Invalid directory: '{0}'".format(path))
+        return False
+
+    if not isinstance(max_bytes, int) or max_bytes < 0:
+        _warn("set_temp_dir: Invalid size: {0}".format(max_bytes))
+        return False
+
+    _config.tempbase, _config.tempbytes = path, max_bytes
+
+    # Next temporary files are stored in a new directory, in the new location
+    _config.tempdir = None
+
+    return True
+
+
+def coalescing():
+    """ 
+    Returns `True` if identical concurrent calls share a single processing.
+
+    *Default:* `False`
+    """
+    return _config.coalescing
+
+
+def set_coalescing(enabled):
+    """ 
+    Enables <or> disables the coalescing of identical concurrent calls of the 
+    __[image_to_data](@@$image_to_data)__ and __[image_to_string](@@$image_to_string)__
+    functions (including their `async` and batch versions).
+
+    While an image is being processed, any other call (from any thread <or> task) 
+    with the same image content, output format(s), data output, language(s) and 
+    configuration waits for that processing and gets its result instead of starting 
+    another `Tesseract` process.
+
+    A waiting call still honors its own __`timeout`__ <or> __`deadline`__. If the
+    processing call gets cancelled, the waiting calls process the image themselves.
+    """
+    _config.coalescing = bool(enabled)
+
+
 def configure(**kw):
     """ 
-    All-in-one function to set the `command`, the `data directory` or/and the 
-    `content separator`.
+    All-in-one function to set the `command`, the `data directory`, the 
+    `content separator`, the `backend`, the `default timeout`, the 
+    `result cache` limits, the `disk cache`, the `coalescing` or/and the 
+    `temporary directory`.
 
-    *Supported keywords*: `command`, `data_dir`, `content_sep`
+    *Supported keywords*: `command`, `data_dir`, `content_sep`, `backend`, `timeout`,
+    `result_cache`, `disk_cache`, `coalescing`, `temp_dir`
 
     *Example usage*:                         
     ```python
@@ -363,9 +1065,12 @@ def configure(**kw):
     configure(command=("tesseract", True), data_dir=("/home/tess/data", True))
     ```
 
-    See __[set_command](@@$set_command)__, __[set_data_dir](@@$set_data_dir)__ 
-    and __[set_content_sep](@@$set_content_sep)__ functions documentation for 
-    more details about the parameters.
+    See __[set_command](@@$set_command)__, __[set_data_dir](@@$set_data_dir)__, 
+    __[set_content_sep](@@$set_content_sep)__, __[set_backend](@@$set_backend)__,
+    __[set_default_timeout](@@$set_default_timeout)__, 
+    __[set_result_cache](@@$set_result_cache)__, 
+    __[set_disk_cache](@@$set_disk_cache)__, __[set_coalescing](@@$set_coalescing)__ 
+    and __[set_temp_dir](@@$set_temp_dir)__ functions documentation for more details about the parameters.
     """
     result = True
     invalid_args = []
@@ -384,7 +1089,31 @@ def configure(**kw):
                     set_data_dir(v)
             elif "content_sep" in k:
                 set_content_sep(v)
-            else:
+            elif "backend" in k:
+                if isinstance(v, (list, tuple)):
+                    set_backend(*v)
+                else:
+                    set_backend(v)
+            elif "timeout" in k:
+                set_default_timeout(v)
+            elif "result_cache" in k:
+                if isinstance(v, (list, tuple)):
+                    set_result_cache(*v)
+                else:
+                    set_result_cache(v)
+            elif "disk_cache" in k:
+                if isinstance(v, (list, tuple)):
+                    set_disk_cache(*v)
+                else:
+                    set_disk_cache(v)
+            elif "coalescing" in k:
+                set_coalescing(v)
+            elif "temp_dir" in k:
+                if isinstance(v, (list, tuple)):
+                    set_temp_dir(*v)
+                else:
+                    set_temp_dir(v)
+            else:
                 invalid_args.append(k)
     else:
         invalid_args.append("<unspecified>")
@@ -403,7 +1132,7 @@ def init():
     - Checks if the `Tesseract` command is valid by trying to start a new process using
     the `runnable` function. If the command fails, it will try to locate the `Tesseract` 
     binary by calling the __[locate](@@$locate)__ function.
-    - Checks if the `Tesseract` data directory has been set by calling the 
+    - Checks if the `Tesseract` data directory has been set, otherwise calls the 
     __[locate_data](@@$locate_data)__ function.
     """
     if not runnable():
@@ -418,8 +1147,115 @@ def init():
         set_data_dir(tess_data_loc)
 
 
+def warm_up(langs=None, ocr=False, timeout=None):
+    """ 
+    Reads the language data files ahead, so the first OCR calls don't have to wait 
+    for them to be loaded from the storage.
+
+    The data directory is located using __[locate_data](@@$locate_data)__ if it 
+    hasn't been set. The `.traineddata` file of each language is read through, after 
+    advising the system to read it ahead (`posix_fadvise`) where supported, so it 
+    ends up in the file system cache.
+
+    > __`langs`__ holds the language(s) to warm up, in the same format as the 
+    > __`lang`__ parameter of the __[image_to_file](@@$image_to_file)__ function.
+    >
+    > *Default:* `eng`
+
+    > If __`ocr`__ is set to `True`, a tiny blank image is also processed once per 
+    > language, so the OCR engine itself (and the libtesseract engines or standby 
+    > processes, if any) gets ready as well.
+
+    > __`timeout`__ holds the maximum duration of each synthetic OCR call in seconds.
+
+    Returns a `dict` holding the data directory path, the number of bytes read and 
+    the time spent (in seconds) reading and processing each warmed up language, and 
+    the total elapsed time. `None` if the data directory couldn't be located.
+
+    *Example*:
+    ```python
+    {
+        "datadir": "/usr/share/tesseract-ocr/5/tessdata",
+        "elapsed": 0.41,
+        "langs": {"eng": {"bytes": 4113088, "read": 0.02, "ocr": 0.39}},
+    }
+    ```
+    """
+    start_time = time.perf_counter()
+    datadir = _config.datadir or locate_data()
+
+    if not datadir:
+        _warn("warm_up: The Tesseract data directory couldn't be located.")
+        return None
+
+    result = {"datadir": datadir, "elapsed": 0.0, "langs": {}}
+
+    for name in _split_langs(_resolve_lang(langs or "eng")):
+        read_time = time.perf_counter()
+        size = _read_ahead(_find_traineddata(datadir, name))
+
+        if size is None:
+            _warn("warm_up: No readable data file for the language '{0}'.".format(name))
+            continue
+
+        info = {"bytes": size, "read": time.perf_counter() - read_time, "ocr": None}
+
+        if ocr:
+            ocr_time = time.perf_counter()
+            image_to_data(_warm_up_image, lang=name, timeout=timeout)
+            info["ocr"] = time.perf_counter() - ocr_time
+
+        result["langs"][name] = info
+
+    result["elapsed"] = time.perf_counter() - start_time
+
+    return result
+
+
+def prepare_image(image):
+    """ 
+    Prepares the given image once and returns a 
+    __[TessyPreparedImage](@@$PreparedImage)__ which can be given as __`image`__ to 
+    any number of `image_to_*` calls, `None` if the image couldn't be prepared.
+
+    Image objects are converted and encoded a single time and image data is read 
+    a single time, instead of once per call. Image paths are kept as is.
+
+    The prepared image data is released by its `close` method <or> at the end of a 
+    `with` block.
+
+    *Example usage*:
+    ```python
+    with tessy.prepare_image(ndarray) as image:
+        osd = tessy.image_to_data(image, "osd")
+        tsv = tessy.image_to_data(image, "tsv")
+        text = tessy.image_to_string(image, lang="deu")
+    ```
+
+    See __[image_to_file](@@$image_to_file)__ documentation for more details about 
+    __`image`__.
+    """
+    if isinstance(image, TessyPreparedImage):
+        return image
+
+    if isinstance(image, str):
+        return TessyPreparedImage(image)
+
+    data = _prepare_input_data(image)
+
+    # Copied once into immutable bytes, so the handle can be shared and pickled
+    return TessyPreparedImage(bytes(data)) if data is not None else None
+
+
 def image_to_file(
-    image, output_filename_base=None, output_format="txt", lang=None, config=None
+    image,
+    output_filename_base=None,
+    output_format="txt",
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
 ):
     """ 
     Extracts any text from the given image and return a list containing a unique file 
@@ -431,7 +1267,13 @@ def image_to_file(
     > - an Pillow `Image`.
     > - an wxPython `Image`.
     > - an PyQt4/PyQt5/PySide `QImage`.
-    > - an OpenCV `NumPy ndarray`.
+    > - an OpenCV/NumPy `ndarray` (grayscale, BGR or BGRA, `OpenCV` isn't required).
+    > - encoded image data (*e.g.*: the content of a PNG file) as `bytes`, `bytearray`,
+    > `memoryview` or binary file-like object.
+    > - a prepared image returned by __[prepare_image](@@$prepare_image)__.
+    >
+    > Image data and image objects are streamed to `Tesseract` through its standard 
+    > input, without any temporary input file.
 
     > __`output_filename_base`__ holds the file name (__without extension__) used 
     > as reference for any output file generated by Tesseract.
@@ -479,192 +1321,91 @@ def image_to_file(
     > __`config`__ must be a string and each parameter delimited by a space.
     >
     > *e.g.*: `"--oem 0 --psm 6"`
-    """
-    result = []
 
-    # Checks if the Tesseract data directory has been specified somewhere
-    if (
-        not _config.datadir
-        and not (config and "--tessdata-dir" in config)
-        and not "TESSDATA_PREFIX" in os.environ
-    ):
-        _warn(
-            "image_to_file: The Tesseract data directory path hasn't been specified, "
-            "the command may fail.\n"
-            "You can specify the location of tessdata path by:\n"
-            " - Calling the 'set_data_dir(<PATH>)' function of this module,\n"
-            " - Adding the '--tessdata-dir <PATH>' parameter using the 'config' "
-            "variable when calling any 'image_to' function,\n"
-            " - Adding the 'TESSDATA_PREFIX' environment variable in your OS."
-        )
+    > __`timeout`__ holds the maximum duration of the call in seconds.
+    >
+    > __`deadline`__ holds the time, as a `time.monotonic()` value, at which the call 
+    > must be over.
+    >
+    > If both are given, the earliest one applies. If none is given, the default 
+    > timeout is used (see __[set_default_timeout](@@$set_default_timeout)__).
+    >
+    > Once expired, the `Tesseract` process (and its process group) is killed, the 
+    > temporary and partial output files of the call are removed and a 
+    > __[TessyTimeoutWarning](@@$TessyTimeoutWarning)__ is raised.
 
-    # Creates a temporary file name for both input and output files
-    in_file = os.path.join(_get_temp_dir(False), _get_temp_file_name())
-    out_file = (
-        os.path.join(_get_temp_dir(False), _get_temp_file_name())
-        if output_filename_base is None
-        else output_filename_base
+    > __`preprocess`__ holds the preprocessing step(s) applied in order to the image
+    > pixels before they're handed to `Tesseract`, `None` for none. Preprocessing
+    > requires `NumPy` (and `Pillow` to decode image paths and image data).
+    >
+    > *Supported steps*:
+    > - `Preprocess.ORIENT`: rotation of the pages turned by 90, 180 <or> 270
+    > degrees, as detected by a `Tesseract` OSD pass run on a downsampled copy of
+    > the image (requires the `osd` language data). The rotation found is cached by
+    > image content, so the same image is only analyzed once. *Options*:
+    > `min_confidence` (minimum orientation confidence to rotate the page, `2.0`).
+    > - `Preprocess.CROP`: blank page detection and cropping to the content. Pages
+    > without any text-like content (clusters of pixels darker <or> lighter than the
+    > background) aren't handed to `Tesseract`:
+    > __[image_to_data](@@$image_to_data)__ returns an empty list for them and no
+    > output file is written. Other pages are cropped to the bounding box of their
+    > content. *Options*: `margin` (pixels kept around the content, `10`),
+    > `contrast` (minimum difference between the gray levels of the background and
+    > the content, `64`), `min_pixels` (minimum number of content pixels, `20`).
+    > - `Preprocess.GRAY`: grayscale conversion.
+    > - `Preprocess.OTSU`: global binarization (Otsu's threshold).
+    > - `Preprocess.SAUVOLA`: local binarization, for unevenly lit images. *Options*:
+    > `window` (window size in pixels, `25`), `k` (`0.2`).
+    > - `Preprocess.DESKEW`: skew correction using the projection profiles of the text
+    > lines. *Options*: `max_angle` (in degrees, `5.0`).
+    > - `Preprocess.DESPECKLE`: removal of the isolated dark pixels. *Options*:
+    > `min_neighbors` (dark neighbors a pixel needs to be kept, `2`).
+    > - `Preprocess.SCALE`: resampling toward the text size `Tesseract` works best
+    > with. The x-height of the text is estimated from the projection profile of its
+    > lines, the image resolution (`dpi` of the Pillow `info`) is used instead if it
+    > can't be. *Options*: `x_height` (target x-height in pixels, `20`), `dpi` (target
+    > resolution, matching the target x-height, `300`).
+    >
+    > __`preprocess`__ can be either:
+    > - a `string` containing one or more step(s) delimited by a comma `,`
+    > - a `list`/`tuple` of steps, each step being a `string` <or> a
+    > `(step, options dict)` tuple
+    >
+    > *e.g.*: `"gray, otsu"`, `["deskew", ("sauvola", {"window": 31, "k": 0.3})]`
+    >
+    > Binarized images are handed to `Tesseract` as 1-bit images. The resolution of
+    > the preprocessed image is passed to `Tesseract` (`--dpi`) when it's known and
+    > __`config`__ doesn't set it. The time spent by each step is reported by
+    > __[preprocess_info](@@$preprocess_info)__.
+    >
+    > The coordinates of the `box`, `tsv` and `hocr` outputs are mapped back to the
+    > original image when a step moves the pixels (`crop`, `orient`, `deskew`,
+    > `scale`).
+    """
+    result = _image_to_file_cached(
+        image,
+        output_filename_base,
+        output_format,
+        lang,
+        config,
+        _config.tempfiles,
+        _get_deadline(timeout, deadline),
+        preprocess,
     )
-
-    # Convert 'output_format' to a tuple
-    if isinstance(output_format, str):
-        output_format = output_format.lower().replace(" ", "")
-
-        if "," in output_format:
-            output_format = tuple(output_format.split(","))
-        else:
-            output_format = (output_format,)
-    elif isinstance(output_format, (tuple, list)):
-        output_format = tuple(fmt.strip().lower() for fmt in output_format)
-    else:
-        _warn(
-            "image_to_file: Unsupported output format. 'output_format' "
-            "must be a string, a list or a tuple."
-        )
-        return result
-
-    # If 'image' is a string (which should contain a file path),
-    # just copy the file at the input temp file location
-    if isinstance(image, str):
-        try:
-            shutil.copyfile(image, in_file)
-        except IOError as e:
-            _warn(
-                "image_to_file: Unable to copy the file '{0}' to '{1}'.\n"
-                "I/O Error ({2}): {3}.".format(image, in_file, e.errno, e.strerror)
-            )
-
-    # We must determine which library must be imported to work with the given
-    # 'image' object
-    # Supported libs: Pillow, wxPython, PyQt 4/5, PySide and OpenCV
-    else:
-        # Gets both library acronym and plain name
-        # - The acronym is used internally as identifier
-        # - The plain name is used for debugging
-        img_lib_name, img_lib_plain_name = _get_image_lib_name_from_object(image)
-
-        if not img_lib_name:
-            _warn(
-                "image_to_file: Unsupported image. 'image' must be an Pillow "
-                "Image, wxPython Image, PyQt/PySide QImage or OpenCV Image (ndarray)."
-            )
-            return result
-
-        # Try to import the corresponding image module
-        img_mod = _import_image_module(img_lib_name)
-
-        if not img_mod:
-            _warn(
-                "image_to_file: Import Error: Unable to import the "
-                "image module from the lib {0}.".format(img_lib_plain_name)
-            )
-            return result
-
-        # Prepare the image using the imported module
-        _prepare_image(image, img_lib_name, img_mod, in_file)
-
-    # If the image has been prepared successfully, the file should be present
-    if os.path.isfile(in_file):
-        global _tempfiles
-
-        _tempfiles.append(in_file)
-
-        # Gets the command
-        tess_cmd = _config.command
-
-        # Make a unaltered copy of the output filename
-        out_file_clean = out_file
-
-        if " " in tess_cmd:
-            tess_cmd = _escape_path(tess_cmd)
-
-        if " " in in_file or " " in out_file:
-            in_file = _escape_path(in_file)
-            out_file = _escape_path(out_file)
-
-        # Pack the command with both input and output files
-        command = [tess_cmd, in_file, out_file]
-
-        # Adds any extra user-defined parameter(s)
-        if config:
-            try:
-                command += shlex.split(config)
-            except Exception as e:
-                _warn(
-                    "image_to_file: Unable to parse the 'config' content. "
-                    "Extra parameter(s) will be ignored.\nError: {0}.".format(e)
-                )
-
-        if "osd" in output_format and not "--psm" in command:
-            command += ["--psm", "0"]
-
-        # Adds the given language(s)
-        if lang:
-            if isinstance(lang, TessyLang):
-                lang = TessyLang.join(lang)
-            elif isinstance(lang, (list, tuple)):
-                lang = TessyLang.join(*lang)
-
-            command += ["-l", lang]
-
-        # .txt format support (default)
-        if "txt" in output_format:
-            command += ["txt"]
-
-        # .box format support
-        if "box" in output_format:
-            command += ["batch.nochop", "makebox"]
-
-        # .pdf format support
-        if "pdf" in output_format:
-            command += ["pdf"]
-
-        # .hocr format support
-        if "hocr" in output_format:
-            command += ["hocr"]
-
-        # .tsv format support
-        if "tsv" in output_format:
-            command += ["tsv"]
-
-        # Converts the command as string
-        command_str = " ".join(command)
-
-        # Run the command and wait
-        status, output, err_string = _proc_exec_wait(command_str)
-
-        # The command has been executed successfully
-        if status == 0:
-            output_files = list(
-                filter(
-                    lambda file: os.path.isfile(file),
-                    list(
-                        map(
-                            lambda fmt: "{0}.{1}".format(out_file_clean, fmt),
-                            output_format,
-                        )
-                    ),
-                )
-            )
-
-            if output_files:
-                _tempfiles.extend(output_files)
-                result.extend(output_files)
-        # Tesseract raised error(s)
-        else:
-            errors = _parse_errors(err_string)
-
-            if errors:
-                _warn(
-                    "image_to_file: Error while executing Tesseract, "
-                    "returned error(s):\n{0}.".format(errors)
-                )
+    _check_temp_size()
 
     return result
 
 
 def image_to_data(
-    image, output_format="txt", data_output=DataOutput.STRING, lang=None, config=None
+    image,
+    output_format="txt",
+    data_output=DataOutput.STRING,
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
 ):
     """ 
     Extracts any text from the given image and return a list containing the converted 
@@ -678,7 +1419,8 @@ def image_to_data(
     > *Default:* `DataOutput.STRING`
     
     See __[image_to_file](@@$image_to_file)__ documentation for more details about 
-    __`image`__, __`output_format`__,  __`lang`__ and __`config`__ parameters.
+    __`image`__, __`output_format`__,  __`lang`__, __`config`__, __`timeout`__,
+    __`deadline`__ and __`preprocess`__ parameters.
 
     *Note*: `pdf` output format isn't supported by this function.
     """
@@ -692,42 +1434,42 @@ def image_to_data(
         )
         return result
 
-    # Call 'image_to_file' function to get the output file(s) list
-    out_files = image_to_file(image, None, output_format, lang, config)
-
-    if out_files and len(out_files) > 0:
-        result = []
-
-        todict_func = {
-            "txt": lambda d: {"data": d},
-            "tsv": lambda d: sv_to_dict(d),
-            "box": lambda d: boxes_to_dict(d),
-            "hocr": lambda d: hocr_to_dict(d),
-            "osd": lambda d: osd_to_dict(d),
-        }
-
-        for fp in out_files:
-            file_data = _read_file(fp, data_output == DataOutput.BYTES)
-            file_ext = os.path.splitext(fp)[1][1:]
-
-            if file_data:
-                if data_output == DataOutput.DICT:
-                    file_data = todict_func[file_ext](file_data)
-
-                result.append(file_data)
+    # Temporary files are tracked per call, so concurrent calls keep their own files
+    tempfiles = []
 
-        clear_temp(False)
+    try:
+        result = _image_to_data(
+            image,
+            output_format,
+            data_output,
+            lang,
+            config,
+            tempfiles,
+            _get_deadline(timeout, deadline),
+            preprocess,
+        )
+    finally:
+        _defer_remove_temp_files(tempfiles)
 
     return result
 
 
-def image_to_string(image, output_format="txt", lang=None, config=None):
+def image_to_string(
+    image,
+    output_format="txt",
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
+):
     """ 
     Extracts any text from the given image and return the data as string for each 
     specified format.
 
     See __[image_to_file](@@$image_to_file)__ documentation for more details about 
-    __`image`__, __`output_format`__,  __`lang`__ and __`config`__ parameters.
+    __`image`__, __`output_format`__,  __`lang`__, __`config`__, __`timeout`__,
+    __`deadline`__ and __`preprocess`__ parameters.
 
     *Note*: `pdf` output format isn't supported by this function.
     """
@@ -741,16 +1483,288 @@ def image_to_string(image, output_format="txt", lang=None, config=None):
         )
         return result
 
-    # Call 'image_to_data' function to get the output data list
-    out_datas = image_to_data(image, output_format, DataOutput.STRING, lang, config)
+    # Temporary files are tracked per call, so concurrent calls keep their own files
+    tempfiles = []
+
+    try:
+        out_datas = _image_to_data(
+            image,
+            output_format,
+            DataOutput.STRING,
+            lang,
+            config,
+            tempfiles,
+            _get_deadline(timeout, deadline),
+            preprocess,
+            "image_to_string",
+        )
+    finally:
+        _defer_remove_temp_files(tempfiles)
+
+    if out_datas:
+        result = _config.contentsep.join(out_datas)
+
+    return result
+
+
+async def image_to_file_async(
+    image,
+    output_filename_base=None,
+    output_format="txt",
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
+):
+    """ 
+    Coroutine version of __[image_to_file](@@$image_to_file)__.
+
+    `Tesseract` is started as an `asyncio` subprocess, so the event loop isn't blocked
+    while the image is processed. The image preparation and
+    preprocessing run in the default executor of the running loop.
+
+    If the awaiting task gets cancelled, the `Tesseract` process is killed.
+
+    See __[image_to_file](@@$image_to_file)__ documentation for more details about 
+    the parameters and the returned value.
+    """
+    result = await _image_to_file_cached_async(
+        image,
+        output_filename_base,
+        output_format,
+        lang,
+        config,
+        _config.tempfiles,
+        _get_deadline(timeout, deadline),
+        preprocess,
+    )
+    _check_temp_size()
+
+    return result
+
+
+async def image_to_data_async(
+    image,
+    output_format="txt",
+    data_output=DataOutput.STRING,
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
+):
+    """ 
+    Coroutine version of __[image_to_data](@@$image_to_data)__.
+
+    Output files are read in the default executor of the running loop.
+
+    See __[image_to_file_async](@@$image_to_file_async)__ and 
+    __[image_to_data](@@$image_to_data)__ documentation for more details.
+    """
+    # PDF format is not supported by this function
+    if output_format and "pdf" in output_format:
+        _warn(
+            "image_to_data_async: PDF format is not supported by this function, "
+            "use 'image_to_file_async' instead."
+        )
+        return None
+
+    return await _image_to_data_async(
+        image,
+        output_format,
+        data_output,
+        lang,
+        config,
+        _get_deadline(timeout, deadline),
+        preprocess,
+        "image_to_data_async",
+    )
+
+
+async def image_to_string_async(
+    image,
+    output_format="txt",
+    lang=None,
+    config=None,
+    timeout=None,
+    deadline=None,
+    preprocess=None,
+):
+    """ 
+    Coroutine version of __[image_to_string](@@$image_to_string)__.
+
+    See __[image_to_file_async](@@$image_to_file_async)__ and 
+    __[image_to_string](@@$image_to_string)__ documentation for more details.
+    """
+    result = None
+
+    # PDF format is not supported by this function
+    if output_format and "pdf" in output_format:
+        _warn(
+            "image_to_string_async: PDF format is not supported by this function, "
+            "use 'image_to_file_async' instead."
+        )
+        return result
+
+    out_datas = await _image_to_data_async(
+        image,
+        output_format,
+        DataOutput.STRING,
+        lang,
+        config,
+        _get_deadline(timeout, deadline),
+        preprocess,
+        "image_to_string_async",
+    )
 
     if out_datas:
         result = _config.contentsep.join(out_datas)
-        clear_temp(False)
 
     return result
 
 
+def image_to_data_many(
+    images,
+    output_format="txt",
+    data_output=DataOutput.STRING,
+    lang=None,
+    config=None,
+    workers=None,
+    pool=Pool.THREAD,
+    group_size=1,
+    timeout=None,
+    preprocess=None,
+):
+    """ 
+    Extracts any text from each given image using a pool of workers and return a list 
+    containing a `(data, errors)` tuple for each image, in the same order as 
+    __`images`__.
+
+    > __`images`__ is an iterable of images. Each image can be of any type supported
+    > by the __[image_to_file](@@$image_to_file)__ function.
+
+    > __`workers`__ holds the maximum number of images processed at the same time.
+    >
+    > If __`workers`__ is set to `None`, the number of CPUs of the machine is used.
+
+    > __`pool`__ specifies the kind of worker pool used to process the images.
+    >
+    > *Supported values*: `Pool.THREAD`, `Pool.PROCESS`
+    >
+    > *Default:* `Pool.THREAD`
+    >
+    > Images given to a `Pool.PROCESS` pool must be picklable (*e.g.*: paths, Pillow
+    > `Image` or OpenCV `ndarray`).
+
+    > __`group_size`__ holds the maximum number of images processed by a single
+    > `Tesseract` process.
+    >
+    > If __`group_size`__ is greater than `1`, images are grouped and passed to 
+    > `Tesseract` through a list file, so the language data is loaded once per group 
+    > instead of once per image. The combined output is then split back into one 
+    > result per image using the page numbers (`tsv`, `box`, `hocr`) or the form feed 
+    > page separators (`txt`).
+    >
+    > If a group fails <or> raises any warning (*e.g.*: an unreadable image or a
+    > multi-page image), each image of the group is processed again individually, so
+    > one bad image doesn't fail the whole group.
+    >
+    > __*Note*: `osd` output format can't be split and is always processed one image 
+    > at a time__.
+    >
+    > *Default:* `1`
+
+    > __`timeout`__ holds the maximum duration in seconds of the processing of each
+    > image (a group of images gets __`timeout`__ seconds per image). A group which 
+    > times out is processed again individually.
+    >
+    > If __`timeout`__ is set to `None`, the default timeout is used.
+
+    > __`preprocess`__ holds the preprocessing step(s) applied to each image, in its
+    > worker (see __[image_to_file](@@$image_to_file)__).
+
+    The __[init](@@$init)__ function is called only once per worker process before 
+    the first image is processed. A failing image doesn't abort the batch.
+
+    See __[image_to_data](@@$image_to_data)__ documentation for more details about 
+    the other parameters.
+
+    *Returned tuple values* (2): `data` (the value returned by `image_to_data`, `None` 
+    on failure), `errors` (warning message(s) raised while processing the image as 
+    string, `None` if there's none)
+    """
+    if group_size and group_size > 1:
+        groups = _batch_map(
+            functools.partial(
+                _batch_image_to_data_group,
+                output_format=output_format,
+                data_output=data_output,
+                lang=lang,
+                config=config,
+                timeout=timeout,
+                preprocess=preprocess,
+            ),
+            _chunks(images, group_size),
+            workers,
+            pool,
+            "image_to_data_many",
+        )
+        return [item for group in groups for item in group]
+
+    return _batch_map(
+        functools.partial(
+            _batch_image_to_data,
+            output_format=output_format,
+            data_output=data_output,
+            lang=lang,
+            config=config,
+            timeout=timeout,
+            preprocess=preprocess,
+        ),
+        images,
+        workers,
+        pool,
+        "image_to_data_many",
+    )
+
+
+def image_to_string_many(
+    images,
+    output_format="txt",
+    lang=None,
+    config=None,
+    workers=None,
+    pool=Pool.THREAD,
+    group_size=1,
+    timeout=None,
+    preprocess=None,
+):
+    """ 
+    Extracts any text from each given image using a pool of workers and return a list 
+    containing a `(string, errors)` tuple for each image, in the same order as 
+    __`images`__.
+
+    See __[image_to_data_many](@@$image_to_data_many)__ documentation for more details 
+    about the parameters and the returned values.
+    """
+    return [
+        _data_to_string(data, errors)
+        for data, errors in image_to_data_many(
+            images,
+            output_format,
+            DataOutput.STRING,
+            lang,
+            config,
+            workers,
+            pool,
+            group_size,
+            timeout,
+            preprocess,
+        )
+    ]
+
+
 def locate():
     """ 
     Tries to locate the Tesseract binary and returns its path if found.
@@ -816,7 +1830,7 @@ def locate_data():
     return None
 
 
-def run(parameters=None, silent=False):
+def run(parameters=None, silent=False, timeout=None, deadline=None):
     """ 
     Run Tesseract with the given parameters and return the output as tuple.
 
@@ -826,43 +1840,57 @@ def run(parameters=None, silent=False):
 
     > If __`silent`__ is set to `True`, warning messages won't be logged.
 
+    See __[image_to_file](@@$image_to_file)__ documentation for more details about 
+    __`timeout`__ and __`deadline`__ parameters.
+
     *Returned values* (3): `status` (returncode/int), `output` (stoutdata/string), 
     `err_string` (sterrdata/string)
+
+    `status` equals `Status.ERROR` if the process couldn't be started and 
+    `Status.TIMEOUT` if it has been killed because its timeout <or> deadline expired.
     """
-    return _proc_exec_wait("{0} {1}".format(_config.command, parameters), silent)
+    command = [_config.command]
+
+    if parameters:
+        args = _split_command_line(parameters, silent)
+
+        if args is None:
+            return (Status.ERROR, None, None)
+
+        command += args
+
+    return _proc_exec_wait(command, silent, deadline=_get_deadline(timeout, deadline))
 
 
 def runnable():
     """ 
     Returns `True` if the Tesseract's process can be started.
+
+    See __[tesseract_info](@@$tesseract_info)__.
     """
-    return tesseract_version() is not None
+    return _get_probe() is not None
 
 
-def start(parameters=None, silent=False):
+def start(parameters=None, silent=False, timeout=None, deadline=None):
     """ 
     Alias of __[run](@@$run)__
     """
-    return run(parameters, silent)
+    return run(parameters, silent, timeout, deadline)
 
 
 def tesseract_version():
     """ 
-    Returns the `LooseVersion` representation of Tesseract's version.
+    Returns the __[TessyVersion](@@$Version)__ representation of Tesseract's 
+    version.
+
+    See __[tesseract_info](@@$tesseract_info)__.
     """
     result = None
+    probe = _get_probe()
 
     try:
-        command = _config.command
-
-        if " " in command:
-            command = _escape_path(command)
-
-        command += " --version"
-        status, output, err_string = _proc_exec_wait(command, True)
-
-        if status == 0:
-            result = LooseVersion(output.split()[1].lstrip(string.printable[10:]))
+        if probe:
+            result = TessyVersion(probe["version"])
     except Exception as e:
         _warn(
             "tesseract_version: Unable to retrieve Tesseract version. "
@@ -872,38 +1900,194 @@ def tesseract_version():
     return result
 
 
-def clear_cache():
+def tesseract_info():
     """ 
-    Tries to remove the `.TESSPATH` cache file and return `True` if successfully deleted.
+    Returns the capabilities of the `Tesseract` command as a `dict`, `None` if the 
+    command can't be started.
+
+    `Tesseract` is only probed once per binary: the result is kept in memory and 
+    stored in a cache file (`.TESSPROBE`) next to the `.TESSPATH` cache file, by 
+    binary path, modification time and size. Updating the binary makes it probed
+    again. The available languages are listed once per data directory content.
+
+    *Returned keys*: `path` (binary path), `version` (version string), `languages` 
+    (list of available languages), `components` (components found by `Tesseract`, 
+    *e.g.*: `AVX2`, `OpenMP 201511`), `renderers` (supported output formats), 
+    `stdin` (`True` if images can be read from the standard input)
     """
-    path_file = os.path.join(_get_temp_dir(), _config.pathfile)
-    return _remove_file(path_file) if os.path.isfile(path_file) else False
+    result = None
+    probe = _get_probe(True)
+
+    if probe:
+        result = {
+            "path": probe["path"],
+            "version": probe["version"],
+            "languages": list(probe["langs"].get(_get_probe_langs_key(), [])),
+            "components": list(probe["components"]),
+            "renderers": list(probe["renderers"]),
+            "stdin": probe["stdin"],
+        }
+
+    return result
+
+
+def installed_langs():
+    """ 
+    Returns the sorted list of the languages installed for the `Tesseract` command, 
+    empty if they can't be determined.
+
+    Languages are listed by `Tesseract` (see __[tesseract_info](@@$tesseract_info)__)
+    and by looking for the `.traineddata` files of the data directory. The list is 
+    updated whenever a file is added to <or> removed from the data directory.
+    """
+    return sorted(_get_installed_langs() or [])
+
+
+def lang_installed(lang):
+    """ 
+    Returns `True` if all the given language(s) are installed.
+
+    Images processed with a language which isn't installed are rejected before 
+    starting `Tesseract`.
+
+    See __[image_to_file](@@$image_to_file)__ documentation for more details about 
+    __`lang`__.
+    """
+    langs = _get_installed_langs()
+
+    try:
+        names = _split_langs(_resolve_lang(lang) if lang else "eng")
+    except ValueError:
+        return False
+
+    return langs is not None and all(name in langs for name in names)
+
+
+def clear_cache():
+    """ 
+    Tries to remove the `.TESSPATH` cache file and return `True` if successfully deleted.
+
+    The `.TESSPROBE` cache file is removed as well and `Tesseract` gets probed again.
+    """
+    probe_file = os.path.join(_get_temp_dir(), _config.probefile)
+
+    with _probe_lock:
+        _probes.clear()
+        _lang_registry.clear()
+
+        if os.path.isfile(probe_file):
+            _remove_file(probe_file)
+
+    path_file = os.path.join(_get_temp_dir(), _config.pathfile)
+    return _remove_file(path_file) if os.path.isfile(path_file) else False
 
 
 def clear_temp(remove_all=True):
     """ 
     Removes temporary files created by Tesseract *(excluding the cache file)*.
 
-    > If __`remove_all`__ is set to `True`, all temporary files will be deleted.      
-    > Otherwise, only temporary files created during execution will be deleted.
+    > If __`remove_all`__ is set to `True`, all files of the temporary directory 
+    > (see __[temp_dir](@@$temp_dir)__) will be deleted.      
+    > Otherwise, only temporary files returned by the 
+    > __[image_to_file](@@$image_to_file)__ functions will be deleted.
+    """
+    tempfiles = _config.tempfiles
+
+    with _temp_cond:
+        tf_list = tempfiles[:]
+        del tempfiles[: len(tf_list)]
+
+    if remove_all and _config.tempdir in _temp_dirs:
+        tf_list += glob.glob(os.path.join(_config.tempdir, "*"))
+
+    _remove_temp_files(tf_list)
+
+
+def standby(count=1, output_format="txt", lang=None, config=None):
+    """ 
+    Keeps __`count`__ `Tesseract` processes started and waiting for an image on their 
+    standard input, for the given output format, language(s) and configuration.
+
+    `Tesseract` loads the language data before reading its standard input, so the 
+    __[image_to_data](@@$image_to_data)__ and __[image_to_string](@@$image_to_string)__ 
+    calls using the same __`output_format`__, __`lang`__ and __`config`__ values are 
+    handed to an already warm process instead of starting a new one. A new standby 
+    process is started in the background each time one is used.
+
+    > __`output_format`__ must contain a single output format (`pdf` excluded).
+
+    > If __`count`__ is set to `0`, the standby processes of the given parameters 
+    > are stopped.
+
+    See __[image_to_file](@@$image_to_file)__ documentation for more details about 
+    __`output_format`__, __`lang`__ and __`config`__ parameters.
+
+    Returns `True` if the standby processes have been set up.
     """
-    tf_list = []
+    output_format = _parse_output_format(output_format)
 
-    if remove_all:
-        temp_dir = _get_temp_dir(False)
-        temp_dir += (
-            os.path.sep if os.path.sep not in temp_dir[len(temp_dir) - 1] else ""
+    if not output_format:
+        return False
+
+    if len(output_format) != 1 or "pdf" in output_format:
+        _warn(
+            "standby: 'output_format' must contain a single output format, "
+            "excluding 'pdf'."
         )
-        tf_list = glob.glob("{0}TESS_*".format(temp_dir))
-    else:
-        global _tempfiles
+        return False
 
-        tf_list = list(_tempfiles)
-        _tempfiles.clear()
+    command = tuple(_build_command("stdin", "stdout", output_format, lang, config))
 
-    for tf in tf_list:
-        if os.path.isfile(tf):
-            _remove_file(tf)
+    if not _check_langs(lang, output_format, config, "standby"):
+        return False
+
+    with _standby_lock:
+        procs = _standby_procs.pop(command, [])
+
+        if count > 0:
+            _standby_counts[command] = count
+            _standby_procs[command] = procs[:count]
+            procs = procs[count:]
+        else:
+            _standby_counts.pop(command, None)
+
+    _kill_procs(procs)
+    _standby_fill(command)
+
+    return True
+
+
+def clear_standby():
+    """ 
+    Stops all the standby `Tesseract` processes started by the 
+    __[standby](@@$standby)__ function.
+    """
+    with _standby_lock:
+        procs = [proc for procs in _standby_procs.values() for proc in procs]
+        _standby_procs.clear()
+        _standby_counts.clear()
+
+    _kill_procs(procs)
+
+
+def clear_result_cache():
+    """ 
+    Removes all the results stored by the result cache and resets its counters.
+
+    See __[set_result_cache](@@$set_result_cache)__.
+    """
+    with _result_cache_lock:
+        _result_cache.clear()
+        _result_cache_stats.update(hits=0, misses=0, evictions=0, bytes=0)
+
+
+def clear_disk_cache():
+    """ 
+    Removes all the entries of the disk cache.
+
+    See __[set_disk_cache](@@$set_disk_cache)__.
+    """
+    _disk_cache_prune(remove_all=True)
 
 
 def sv_to_dict(sv_data, cell_delimiter="\t"):
@@ -1005,7 +2189,7 @@ def hocr_to_dict(hocr_data):
     """
     result = {}
 
-    if not XMLTODICT_INSTALLED:
+    if not _is_module_installed("xmltodict"):
         _warn(
             "hocr_to_dict: Unable to parse hocr data: The 'xmltodict' module is missing."
             "Ensure to install it using `pip install -U xmltodict` before calling "
@@ -1071,6 +2255,14 @@ def osd_to_dict(osd_data):
     return result
 
 
+@functools.lru_cache(maxsize=None)
+def _is_module_installed(name):
+    """
+    Returns True if the given module can be imported.
+    """
+    return importlib.util.find_spec(name) is not None
+
+
 def _locate_from_cache_file():
     """
     Checks if the cache file is present inside the temporary directory.
@@ -1100,298 +2292,4210 @@ def _locate_from_registry():
     return result
 
 
-def _get_image_lib_name_from_object(obj):
+def _get_probe(with_langs=False):
     """
-    Hackish way to determine from which image lib 'obj' come from
-    without importing each lib module individually.
+    Returns the capabilities of the current Tesseract command, None if it can't be
+    started.
+
+    Binaries are probed once per (path, modification time, size) and the result is
+    stored in the probe file. If 'with_langs' is set to True, the languages of the 
+    current data directory are listed as well.
     """
-    result = ()
+    path = _which(_config.command, os.environ.get("PATH"))
 
-    if obj is not None:
-        # PIL/Pillow Image
-        if hasattr(obj, "_close_exclusive_fp_after_loading"):
-            result = ("pil", "PIL/Pillow")
-        # wxPython Image
-        elif hasattr(obj, "FindFirstUnusedColour") and hasattr(
-            obj, "GetImageExtWildcard"
-        ):
-            result = ("wx", "wxPython")
-        # PyQt4, PyQt5 or PySide QImage
-        elif hasattr(obj, "createHeuristicMask") and hasattr(obj, "setDotsPerMeterX"):
-            result = ("qt", "PyQt(4-5)/PySide(1.x)")
-        # OpenCV Image (NumPy ndarray)
-        elif hasattr(obj, "argpartition") and hasattr(obj, "newbyteorder"):
-            result = ("cv", "OpenCV")
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
 
-    return result
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    changed = False
 
+    with _probe_lock:
+        if not _probes:
+            _probes.update(_read_probe_file())
 
-def _import_image_module(mn):
-    """
-    Tries to import the corresponding image module and return it.
+        probe = _probes.get(path)
 
-    Modules won't be re-imported if they have already been cached.
-    """
-    global _image_modules
+        if probe is None or probe["stamp"] != stamp or probe["version"] is None:
+            probe = _run_probe(path, stamp)
 
-    result = None
+            # Failed probes aren't stored, the binary gets probed again next time
+            if probe["version"] is None:
+                return None
 
-    # Don't re-import existing cached modules
-    if mn in _image_modules and _image_modules[mn] is not None:
-        result = _image_modules[mn]
-    else:
-        # Import the 'Image' module from PIL
-        if mn == "pil":
-            try:
-                result = importlib.import_module("PIL.Image")
-            except (ImportError, RuntimeError):
-                pass
+            _probes[path] = probe
+            changed = True
 
-        # Import wxPython
-        elif mn == "wx":
-            try:
-                result = importlib.import_module("wx")
-            except (ImportError, RuntimeError):
-                pass
+        if with_langs:
+            langs_key = _get_probe_langs_key()
 
-        # Import the 'QImage' module from PyQt5, PyQt4 or PySide
-        elif mn == "qt":
-            try:
-                result = importlib.import_module("PyQt5.QtGui").QImage
-            except (ImportError, RuntimeError):
-                try:
-                    result = importlib.import_module("PyQt4.QtGui").QImage
-                except (ImportError, RuntimeError):
-                    try:
-                        result = importlib.import_module("PySide.QtGui").QImage
-                    except ImportError:
-                        pass
+            if langs_key not in probe["langs"]:
+                langs = _run_probe_langs(path)
 
-        # Import OpenCV
-        elif mn == "cv":
-            try:
-                result = importlib.import_module("cv2")
-            except (ImportError, RuntimeError):
-                pass
+                if langs is not None:
+                    probe["langs"][langs_key] = langs
+                    changed = True
 
-        if result:
-            _image_modules[mn] = result
+        if changed:
+            _write_probe_file()
 
-    return result
+    return probe
 
 
-def _prepare_image(image, img_lib_name, img_mod, img_save_path):
+@functools.lru_cache(maxsize=16)
+def _which(command, path_env):
     """
-    Prepares the given image before being passed to Tesseract.
+    Cached absolute path of the given command, by command and PATH value.
+    """
+    path = shutil.which(command, path=path_env)
+    return os.path.abspath(path) if path else None
+
 
-    The procedure is the same for each lib:
-    - Makes a clone of the given image to avoid modifications of the original object
-    - Removes/replaces the alpha channel (if the image has one)
-    - Saves the cloned image at the given save path location
-    - Deletes the cloned image object
+def _run_probe(path, stamp):
     """
-    # Pillow
-    if img_lib_name == "pil":
-        pil_image = image.copy()
+    Starts the given Tesseract binary to get its version and returns its 
+    capabilities. The returned version equals None if the binary can't be started.
+    """
+    result = {"path": path, "stamp": stamp, "version": None, "langs": {}}
 
-        try:
-            chan = pil_image.split()
+    status, output, err_string = _proc_exec_wait(
+        [path, "--version"], True, deadline=_get_deadline(None, None)
+    )
 
-            if len(chan) == 4:
-                pil_image = img_mod.merge("RGB", (chan[0], chan[1], chan[2]))
+    if status != 0 or not output:
+        return result
 
-            try:
-                pil_image.save(img_save_path, "BMP")
-            except IOError as e:
-                _warn(
-                    "_prepare_image: (Pillow) Could not save the image to '{0}'. "
-                    "I/O Error ({1}): {2}.".format(img_save_path, e.errno, e.strerror)
-                )
-        except Exception as e:
-            _warn(
-                "_prepare_image: (Pillow) Unable to split and convert "
-                "the image to RGB. Error: {0}.".format(e)
-            )
-        finally:
-            del pil_image
+    try:
+        version = output.split()[1].lstrip(string.printable[10:])
+    except IndexError:
+        return result
 
-    # wxPython
-    elif img_lib_name == "wx":
-        wx_image = image.Copy()
+    numbers = tuple(int(n) for n in re.findall(r"\d+", version)[:2])
+    renderers = ["txt", "box", "pdf", "hocr", "osd"]
 
-        try:
-            # No idea if 'ClearAlpha' can raise an exception
-            if wx_image.HasAlpha():
-                wx_image.ClearAlpha()
+    if numbers >= (3, 5):
+        renderers.append("tsv")
 
-            try:
-                wx_image.SaveFile(img_save_path, img_mod.BITMAP_TYPE_BMP)
-            except IOError as e:
-                _warn(
-                    "_prepare_image: (wxPython) Could not save the image to '{0}'. "
-                    "I/O Error({1}): {2}.".format(img_save_path, e.errno, e.strerror)
-                )
-        except Exception as e:
-            _warn(
-                "_prepare_image: (wxPython) Unable to remove the alpha channel "
-                "from the image. Error: {0}.".format(e)
-            )
-        finally:
-            del wx_image
+    if numbers >= (4, 1):
+        renderers.extend(["alto", "lstmbox", "wordstrbox"])
 
-    # PyQt/PySide
-    elif img_lib_name == "qt":
-        qt_image = img_mod(image)
+    result["version"] = version
+    result["renderers"] = renderers
+    result["stdin"] = numbers >= (3, 3)
+    result["components"] = [
+        line.strip()[6:]
+        for line in output.splitlines()
+        if line.strip().startswith("Found ")
+    ]
 
-        try:
-            if qt_image.hasAlphaChannel():
-                qt_image = qt_image.convertToFormat(img_mod.Format_RGB32)
+    return result
 
-            try:
-                # Save the image with max quality
-                qt_image.save(img_save_path, "BMP", 100)
-            except Exception as e:
-                _warn(
-                    "_prepare_image: (PyQt/PySide) Could not save the image to "
-                    "'{0}'. Error: {1}.".format(img_save_path, e)
-                )
-        except Exception as e:
-            _warn(
-                "_prepare_image: (PyQt/PySide) Unable to convert the image to RGB."
-                "Error: {0}.".format(e)
-            )
-        finally:
-            del qt_image
 
-    # OpenCV
-    elif img_lib_name == "cv":
-        cv_image = image.copy()
+def _run_probe_langs(path):
+    """
+    Starts the given Tesseract binary to list the available languages, None if the
+    languages can't be listed.
+    """
+    command = [path, "--list-langs"]
 
-        # OpenCV 'imwrite' require a valid file extension
-        img_save_path_bmp = "{0}.bmp".format(img_save_path)
+    if _config.datadir:
+        command += ["--tessdata-dir", _config.datadir]
 
-        try:
-            if len(cv_image.shape) > 2 and cv_image.shape[2] == 4:
-                rt, th = img_mod.threshold(
-                    cv_image[:, :, 3], 254, 255, img_mod.THRESH_BINARY
-                )
-                cv_image = img_mod.bitwise_not(
-                    img_mod.bitwise_not(cv_image[:, :, :3], mask=th)
-                )
+    status, output, err_string = _proc_exec_wait(
+        command, True, deadline=_get_deadline(None, None)
+    )
 
-            if img_mod.imwrite(img_save_path_bmp, cv_image):
-                try:
-                    os.rename(img_save_path_bmp, img_save_path)
-                except OSError as e:
-                    _warn(
-                        "_prepare_image: (OpenCV) Could not rename the image "
-                        "file from '{0}' to '{1}'. Error: {2}.".format(
-                            img_save_path_bmp, img_save_path, e
-                        )
-                    )
-            else:
-                _warn(
-                    "_prepare_image: (OpenCV) Could not save the image to "
-                    "'{0}'.".format(img_save_path_bmp)
-                )
-        except Exception as e:
-            _warn(
-                "_prepare_image: (OpenCV) Unable to remove the alpha channel "
-                "from the image. Error: {0}.".format(e)
-            )
-        finally:
-            del cv_image
+    if status != 0 or output is None:
+        return None
 
+    # The first line describes the data directory
+    return [line.strip() for line in output.splitlines()[1:] if line.strip()]
 
-def _proc_exec_wait(command_line, silent=False):
-    """
-    Starts a new process and wait until it ends.
 
-    If 'silent' is set to True, all warning messages will be ignored.
+def _get_probe_langs_key():
     """
-    result = (-1, None, None)
-    command = None
-    proc = None
-
-    if _platform_windows:
-        command_line = command_line.replace("\\", "/")
+    Returns the key of the languages list of the current data directory, which 
+    changes whenever a language data file is added or removed.
+    """
+    datadir = _config.datadir or os.environ.get("TESSDATA_PREFIX") or ""
 
     try:
-        command = shlex.split(command_line)
-    except Exception as e:
-        if not silent:
-            _warn(
-                "_proc_exec_wait: Unable to parse the given command line: {0}\n"
-                "Error: {1}.".format(command_line, e)
-            )
-        return result
+        mtime = os.stat(datadir).st_mtime_ns if datadir else 0
+    except OSError:
+        mtime = 0
+
+    return "{0}|{1}".format(datadir, mtime)
+
+
+def _read_probe_file():
+    """
+    Returns the probes stored in the probe file, by binary path.
+    """
+    probe_file = os.path.join(_get_temp_dir(), _config.probefile)
 
     try:
-        sp_kwargs = {
-            "stdout": subprocess.PIPE,
-            "stderr": subprocess.PIPE,
-            "startupinfo": None,
-            "env": os.environ,
-        }
+        with open(probe_file, "r", encoding="utf-8") as f:
+            probes = json.load(f)
 
-        if _platform_windows:
-            sp_kwargs["startupinfo"] = subprocess.STARTUPINFO()
-            sp_kwargs["startupinfo"].dwFlags = (
-                subprocess.CREATE_NEW_CONSOLE | subprocess.STARTF_USESHOWWINDOW
-            )
-            sp_kwargs["startupinfo"].wShowWindow = subprocess.SW_HIDE
+        if isinstance(probes, dict):
+            return probes
+    except (OSError, ValueError):
+        pass
 
-        proc = subprocess.Popen(command, **sp_kwargs)
-        stdoutdata, stderrdata = proc.communicate()
-        status = proc.returncode
-        result = (status, stdoutdata.decode("utf8"), stderrdata.decode("utf8"))
-    except Exception as e:
-        if not silent:
-            _warn(
-                "_proc_exec_wait: Could not open the process: '{0}'\n"
-                "Error: {1}.".format(command[0], e)
-            )
-    finally:
-        if proc:
-            if proc.stdout:
-                proc.stdout.close()
+    return {}
 
-            if proc.stderr:
-                proc.stderr.close()
 
-    return result
+def _write_probe_file():
+    """
+    Stores the successful probes in the probe file, atomically.
+    """
+    probe_file = os.path.join(_get_temp_dir(), _config.probefile)
+    temp_path = "{0}.{1}.tmp".format(probe_file, _get_temp_file_name())
 
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {path: p for path, p in _probes.items() if p["version"] is not None}, f
+            )
 
-def _get_temp_dir(use_preserved=True):
+        os.replace(temp_path, probe_file)
+    except OSError as e:
+        _remove_temp_files([temp_path])
+        _warn(
+            "_write_probe_file: Could not write the file '{0}'\n"
+            "OS Error ({1}): {2}.".format(probe_file, e.errno, e.strerror)
+        )
+
+
+def _image_to_file(
+    image, output_filename_base, output_format, lang, config, tempfiles, deadline=None
+):
     """
-    Returns the location of the system temporary directory.
+    Core of the 'image_to_file' function.
 
-    If 'use_preserved' is set to True, the preserved temporary directory will be 
-    used on Linux and macOS.
+    Every temporary file created during the call is appended to 'tempfiles', unless 
+    the call timed out.
     """
-    result = tempfile.gettempdir()
+    result = []
+    call_tempfiles = []
 
-    if not _platform_windows:
-        preserved_tempdir = "/var/tmp"
+    job = _image_to_file_prepare(
+        image, output_filename_base, output_format, lang, config, call_tempfiles
+    )
 
-        if os.path.isdir(preserved_tempdir):
-            result = preserved_tempdir
+    if job:
+        command, out_file, output_format, input_data = job
+
+        # Run the command and wait
+        status, output, err_string = _proc_exec_wait(
+            command, input_data=input_data, deadline=deadline
+        )
+
+        result = _image_to_file_collect(
+            out_file, output_format, status, err_string, call_tempfiles
+        )
+        _keep_temp_files(status, call_tempfiles, tempfiles)
+    else:
+        tempfiles.extend(call_tempfiles)
 
     return result
 
 
-def _get_temp_file_name():
+def _image_to_file_cached(
+    image,
+    output_filename_base,
+    output_format,
+    lang,
+    config,
+    tempfiles,
+    deadline,
+    preprocess=None,
+):
     """
-    Returns a random temporary file name with 'TESS_' prefix.
+    '_image_to_file' checking the disk cache (if enabled) before preprocessing the
+    image (see '_preprocess_image') and processing it.
+
+    The coordinates of the output files are mapped back to the original image, no
+    output file is written for blank pages.
     """
-    tmpfile = tempfile.NamedTemporaryFile(prefix="TESS_")
-    h, t = ntpath.split(tmpfile.name)
-    return t or ntpath.basename(h)
+    steps = _parse_preprocess(preprocess) if preprocess else None
+
+    if not _config.diskcache:
+        pixels, config, transform = _preprocess_image(image, steps, config)
+
+        # Blank pages have no text to extract
+        if pixels is None and image is not None:
+            return []
+
+        result = _image_to_file(
+            _unwrap_image(pixels),
+            output_filename_base,
+            output_format,
+            lang,
+            config,
+            tempfiles,
+            deadline,
+        )
 
+        return _map_output_files(result, transform)
 
-def _read_file(filepath, return_bytes=False):
-    """
-    Reads and return the given file name content.
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return []
+
+    image, cache_key = _get_cache_key(image, output_format, None, lang, config, steps)
+    result = _disk_cache_restore_files(cache_key, output_filename_base, tempfiles)
+
+    if not result:
+        pixels, config, transform = _preprocess_image(image, steps, config)
+
+        # Blank pages have no text to extract
+        if pixels is None and image is not None:
+            return []
+
+        result = _image_to_file(
+            _unwrap_image(pixels),
+            output_filename_base,
+            output_format,
+            lang,
+            config,
+            tempfiles,
+            deadline,
+        )
+        _disk_cache_put(cache_key, _map_output_files(result, transform))
+
+    return result
+
+
+def _image_to_file_prepare(
+    image,
+    output_filename_base,
+    output_format,
+    lang,
+    config,
+    tempfiles,
+    caller_name="image_to_file",
+):
+    """
+    Prepares the input file and builds the Tesseract command of an 
+    'image_to_file' call. 'caller_name' prefixes the warnings of the languages
+    check.
+
+    Returns a (command, output filename base, output formats, input data) tuple
+    or None if the input couldn't be prepared. 'input data' holds the bytes to write 
+    to the process standard input, or None if the image is read from a file.
+    """
+    result = None
+
+    _check_data_dir(config)
+
+    # Convert 'output_format' to a tuple
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return result
+
+    # Unavailable languages are rejected before creating anything
+    if not _check_langs(lang, output_format, config, caller_name):
+        return result
+
+    # Creates a temporary file name for both input and output files
+    in_file = _get_temp_path()
+    out_file = (
+        _get_temp_path() if output_filename_base is None else output_filename_base
+    )
+
+    # In-memory images are streamed to the process standard input when supported
+    if not isinstance(image, str):
+        probe = _get_probe()
+
+        if not probe or probe.get("stdin", True):
+            input_data = _prepare_input_data(image, True)
+
+            if input_data is not None:
+                command = _build_command("stdin", out_file, output_format, lang, config)
+                result = (command, out_file, output_format, input_data)
+
+            return result
+
+        # Older Tesseract versions only read image files
+        if _prepare_input_file(image, in_file):
+            tempfiles.append(in_file)
+            command = _build_command(in_file, out_file, output_format, lang, config)
+            result = (command, out_file, output_format, None)
+
+        return result
+
+    # Image paths are passed as is to Tesseract whenever possible
+    in_path = _get_input_path(image, in_file)
+
+    if in_path:
+        if in_path == in_file:
+            tempfiles.append(in_file)
+
+        command = _build_command(in_path, out_file, output_format, lang, config)
+
+        result = (command, out_file, output_format, None)
+
+    return result
+
+
+def _check_data_dir(config):
+    """
+    Warns if the Tesseract data directory hasn't been specified anywhere.
+    """
+    if (
+        not _config.datadir
+        and not (config and "--tessdata-dir" in config)
+        and not "TESSDATA_PREFIX" in os.environ
+    ):
+        _warn(
+            "image_to_file: The Tesseract data directory path hasn't been specified, "
+            "the command may fail.\n"
+            "You can specify the location of tessdata path by:\n"
+            " - Calling the 'set_data_dir(<PATH>)' function of this module,\n"
+            " - Adding the '--tessdata-dir <PATH>' parameter using the 'config' "
+            "variable when calling any 'image_to' function,\n"
+            " - Adding the 'TESSDATA_PREFIX' environment variable in your OS."
+        )
+
+
+def _parse_output_format(output_format):
+    """
+    Converts the given output format(s) to a tuple of lowercase format names.
+
+    Returns None if 'output_format' isn't a string, a list or a tuple.
+    """
+    result = None
+
+    if isinstance(output_format, str):
+        output_format = output_format.lower().replace(" ", "")
+
+        if "," in output_format:
+            result = tuple(output_format.split(","))
+        else:
+            result = (output_format,)
+    elif isinstance(output_format, (tuple, list)):
+        result = tuple(fmt.strip().lower() for fmt in output_format)
+    else:
+        _warn(
+            "image_to_file: Unsupported output format. 'output_format' "
+            "must be a string, a list or a tuple."
+        )
+
+    return result
+
+
+def _prepare_input_file(image, in_file):
+    """
+    Copies or saves the given image at the 'in_file' location.
+
+    Returns True if the input file is present once done.
+    """
+    # If 'image' is a string (which should contain a file path),
+    # just link or copy the file at the input temp file location
+    if isinstance(image, str):
+        _link_or_copy_file(image, in_file)
+
+    # Encoded image data (bytes, memoryview, file-like object)
+    elif _is_image_data(image):
+        input_data = _prepare_input_data(image)
+
+        if input_data is not None:
+            try:
+                with open(in_file, "wb") as f:
+                    f.write(input_data)
+            except IOError as e:
+                _warn(
+                    "image_to_file: Unable to write the image data to '{0}'.\n"
+                    "I/O Error ({1}): {2}.".format(in_file, e.errno, e.strerror)
+                )
+
+    # Image object from a supported lib
+    else:
+        img_lib = _get_image_lib(image)
+
+        if img_lib:
+            # Prepare the image using the imported module
+            _prepare_image(image, img_lib[0], img_lib[1], in_file)
+
+    return os.path.isfile(in_file)
+
+
+def _get_input_path(image, in_file):
+    """
+    Returns the path of the file passed to Tesseract for the given image path.
+
+    The absolute image path is returned as is if it's a readable file. Otherwise, 
+    the image is linked (or copied, as a last resort) at the 'in_file' location, 
+    which is returned.
+
+    Returns None if the image couldn't be linked or copied.
+    """
+    path = os.path.abspath(image)
+
+    if os.path.isfile(path) and os.access(path, os.R_OK):
+        return path
+
+    return in_file if _link_or_copy_file(image, in_file) else None
+
+
+def _link_or_copy_file(src, dst):
+    """
+    Makes the 'src' file available at the 'dst' location using a hard link, 
+    a symbolic link or a copy, in that order.
+
+    Returns True on success.
+    """
+    if os.path.isfile(src):
+        try:
+            os.link(src, dst)
+            return True
+        except (OSError, AttributeError, NotImplementedError):
+            pass
+
+        try:
+            os.symlink(os.path.abspath(src), dst)
+            return True
+        except (OSError, AttributeError, NotImplementedError):
+            pass
+
+    try:
+        shutil.copyfile(src, dst)
+        return True
+    except IOError as e:
+        _warn(
+            "image_to_file: Unable to copy the file '{0}' to '{1}'.\n"
+            "I/O Error ({2}): {3}.".format(src, dst, e.errno, e.strerror)
+        )
+
+    return False
+
+
+def _prepare_input_data(image, split=False):
+    """
+    Returns the given image as encoded image data to be written to the Tesseract
+    process standard input.
+
+    - `bytes`, `bytearray` and `memoryview` are returned as is (without copy).
+    - Binary file-like objects are read from their current position.
+    - Image objects from a supported lib are encoded in memory as PGM/PPM images. If 
+    'split' is set to True, they are returned as a (header, pixels) tuple sharing the
+    image memory (see '_proc_exec_wait') instead of a single buffer.
+
+    Returns None if the image couldn't be prepared.
+    """
+    result = None
+
+    if isinstance(image, (bytes, bytearray)):
+        result = image
+    elif isinstance(image, memoryview):
+        result = image if image.contiguous else image.tobytes()
+    elif _is_image_data(image):
+        try:
+            result = image.read()
+        except (IOError, ValueError) as e:
+            _warn("image_to_file: Unable to read the image data. Error: {0}.".format(e))
+    else:
+        img_lib = _get_image_lib(image)
+
+        if img_lib:
+            pnm = _prepare_image(image, img_lib[0], img_lib[1])
+
+            if pnm is not None:
+                result = pnm if split else b"".join(pnm)
+
+    if result is not None and len(result) == 0:
+        _warn("image_to_file: The given image data is empty.")
+        result = None
+
+    return result
+
+
+def _unwrap_image(image):
+    """
+    Returns the path <or> encoded data held by the given prepared image, other 
+    images are returned as is.
+
+    A released prepared image is returned as empty data.
+    """
+    if not isinstance(image, TessyPreparedImage):
+        return image
+
+    if image.closed:
+        _warn("image_to_file: The prepared image has been closed.")
+        return b""
+
+    return image._source
+
+
+def _is_image_data(image):
+    """
+    Returns True if the given image holds encoded image data (bytes-like or binary
+    file-like object) instead of an image object.
+    """
+    return isinstance(image, (bytes, bytearray, memoryview)) or (
+        hasattr(image, "read") and not _get_image_lib_name_from_object(image)
+    )
+
+
+def _get_image_lib(image):
+    """
+    Returns a (lib acronym, imported module) tuple for the given image object or None
+    if the image isn't supported or the module can't be imported.
+    """
+    # We must determine which library must be imported to work with the given
+    # 'image' object
+    # Supported libs: Pillow, wxPython, PyQt 4/5, PySide and NumPy/OpenCV
+
+    # Gets both library acronym and plain name
+    # - The acronym is used internally as identifier
+    # - The plain name is used for debugging
+    img_lib = _get_image_lib_name_from_object(image)
+
+    if not img_lib:
+        _warn(
+            "image_to_file: Unsupported image. 'image' must be a path, image data "
+            "(bytes, memoryview or binary file-like object), an Pillow Image, "
+            "wxPython Image, PyQt/PySide QImage or NumPy/OpenCV Image (ndarray)."
+        )
+        return None
+
+    img_lib_name, img_lib_plain_name = img_lib
+
+    # Try to import the corresponding image module
+    img_mod = _import_image_module(img_lib_name)
+
+    if not img_mod:
+        _warn(
+            "image_to_file: Import Error: Unable to import the "
+            "image module from the lib {0}.".format(img_lib_plain_name)
+        )
+        return None
+
+    return (img_lib_name, img_mod)
+
+
+def _build_command(in_file, out_file, output_format, lang, config):
+    """
+    Builds and returns the Tesseract command arguments list for the given input file, 
+    output filename base and output formats.
+
+    Only the input and output slots are filled per call, the remaining arguments 
+    come from a cached template.
+    """
+    template = _get_command_template(
+        tuple(output_format),
+        _resolve_lang(lang) if lang else None,
+        config,
+        _config.datadir,
+    )
+
+    return [_config.command, in_file, out_file, *template]
+
+
+@functools.lru_cache(maxsize=256)
+def _get_command_template(output_format, lang, config, datadir=None):
+    """
+    Returns the (immutable) tuple of Tesseract arguments following the input and 
+    output files for the given output formats, language(s) string, config and data
+    directory.
+    """
+    command = []
+
+    # Adds any extra user-defined parameter(s)
+    if config:
+        config_args = _split_config(config)
+
+        if config_args is None:
+            _warn(
+                "image_to_file: Unable to parse the 'config' content. "
+                "Extra parameter(s) will be ignored."
+            )
+        else:
+            command += config_args
+
+    # The data directory is given per call, unless the config already specifies it
+    if datadir and not "--tessdata-dir" in command:
+        command = ["--tessdata-dir", datadir] + command
+
+    if "osd" in output_format and not "--psm" in command:
+        command += ["--psm", "0"]
+
+    # Adds the given language(s)
+    if lang:
+        command += ["-l", lang]
+
+    # .txt format support (default)
+    if "txt" in output_format:
+        command += ["txt"]
+
+    # .box format support
+    if "box" in output_format:
+        command += ["batch.nochop", "makebox"]
+
+    # .pdf format support
+    if "pdf" in output_format:
+        command += ["pdf"]
+
+    # .hocr format support
+    if "hocr" in output_format:
+        command += ["hocr"]
+
+    # .tsv format support
+    if "tsv" in output_format:
+        command += ["tsv"]
+
+    return tuple(command)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_config(config):
+    """
+    Splits the given 'config' string into a list of arguments.
+
+    Returns None if 'config' can't be parsed.
+    """
+    try:
+        return shlex.split(config)
+    except ValueError:
+        return None
+
+
+def _resolve_lang(lang):
+    """
+    Returns the given language(s) as a string of languages joined by the `+` 
+    separator.
+    """
+    if not lang or isinstance(lang, str):
+        return lang
+
+    if isinstance(lang, list):
+        lang = tuple(lang)
+
+    return _join_langs(lang)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_langs(lang):
+    """
+    Cached tuple of the languages of a `+` joined languages string.
+    """
+    return tuple(name.strip() for name in lang.split("+") if name.strip())
+
+
+def _check_langs(lang, output_format, config, caller_name):
+    """
+    Returns False and warns if any language required by the given language(s) and
+    output format(s) isn't installed.
+
+    Returns True if the installed languages can't be determined or if a specific
+    data directory is given in 'config'.
+    """
+    langs = _get_installed_langs()
+
+    if langs is None or (config and "--tessdata-dir" in config):
+        return True
+
+    names = _split_langs(_resolve_lang(lang) if lang else "eng")
+
+    if "osd" in output_format:
+        names += ("osd",)
+
+    missing = [name for name in names if name not in langs]
+
+    if missing:
+        _warn(
+            "{0}: Language(s) not installed: {1}.".format(
+                caller_name, ", ".join(missing)
+            )
+        )
+
+    return not missing
+
+
+def _get_installed_langs():
+    """
+    Returns the set of installed languages of the current data directory, None if
+    they can't be determined.
+
+    The set is built once per data directory content from the languages listed by
+    Tesseract and the '.traineddata' files of the data directory.
+    """
+    key = _get_probe_langs_key()
+
+    with _probe_lock:
+        if key in _lang_registry:
+            return _lang_registry[key]
+
+    probe = _get_probe(True)
+    langs = set(probe["langs"].get(key, [])) if probe else set()
+    datadir = _config.datadir or os.environ.get("TESSDATA_PREFIX")
+
+    if datadir:
+        for data_path in (datadir, os.path.join(datadir, "tessdata")):
+            try:
+                langs.update(
+                    name[: -len(".traineddata")]
+                    for name in os.listdir(data_path)
+                    if name.endswith(".traineddata")
+                )
+            except OSError:
+                pass
+
+    # Nothing can be checked if no language is listed nor found in the data directory
+    result = frozenset(langs) if langs else None
+
+    with _probe_lock:
+        _lang_registry[key] = result
+
+    return result
+
+
+def _find_traineddata(datadir, lang):
+    """
+    Returns the path of the '.traineddata' file of the given language within the 
+    data directory (or its 'tessdata' subdirectory), None if not found.
+    """
+    for data_path in (datadir, os.path.join(datadir, "tessdata")):
+        path = os.path.join(data_path, "{0}.traineddata".format(lang))
+
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def _read_ahead(path):
+    """
+    Reads the given file through, after advising the system to read it ahead, so it 
+    ends up in the file system cache.
+
+    Returns the number of bytes read, None if the file can't be read.
+    """
+    if not path:
+        return None
+
+    size = 0
+    buffer = bytearray(1024 * 1024)
+
+    try:
+        with open(path, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+            count = f.readinto(buffer)
+
+            while count:
+                size += count
+                count = f.readinto(buffer)
+    except OSError:
+        return None
+
+    return size
+
+
+@functools.lru_cache(maxsize=256)
+def _join_langs(lang):
+    """
+    Cached 'TessyLang.join' of a single TessyLang or a tuple of languages.
+    """
+    if isinstance(lang, TessyLang):
+        return TessyLang.join(lang)
+
+    return TessyLang.join(*lang)
+
+
+def _image_to_file_collect(out_file, output_format, status, err_string, tempfiles):
+    """
+    Returns the list of output files generated by an executed 'image_to_file' 
+    command.
+
+    The partial output files of a timed out command are removed.
+    """
+    result = []
+
+    # The command has been executed successfully
+    if status == 0:
+        output_files = list(
+            filter(
+                lambda file: os.path.isfile(file),
+                list(
+                    map(
+                        lambda fmt: "{0}.{1}".format(out_file, fmt),
+                        output_format,
+                    )
+                ),
+            )
+        )
+
+        if output_files:
+            tempfiles.extend(output_files)
+            result.extend(output_files)
+    # Tesseract has been killed
+    elif status == Status.TIMEOUT:
+        _defer_remove_temp_files(
+            ["{0}.{1}".format(out_file, fmt) for fmt in output_format]
+        )
+    # Tesseract raised error(s)
+    else:
+        _warn_tesseract_errors(err_string)
+
+    return result
+
+
+def _read_output_stdout(output, fmt, status, err_string, data_output, transform=None):
+    """
+    Converts the data written by Tesseract to its standard output according to 
+    'data_output'. Its coordinates are mapped through 'transform' if set (see
+    '_map_output').
+
+    Returns None if the command failed.
+    """
+    result = None
+
+    # The command has been executed successfully
+    if status == 0:
+        result = []
+        output = _map_output(output, fmt, transform)
+
+        output_data = (
+            output.encode("utf-8")
+            if data_output == DataOutput.BYTES
+            else output.strip()
+        )
+
+        if output_data:
+            if data_output == DataOutput.DICT:
+                output_data = _data_to_dict(output_data, fmt)
+
+            result.append(output_data)
+    # Tesseract raised error(s)
+    else:
+        _warn_tesseract_errors(err_string)
+
+    return result
+
+
+def _warn_tesseract_errors(err_string):
+    """
+    Warns about the error(s) returned by a failed Tesseract process.
+    """
+    errors = _parse_errors(err_string)
+
+    if errors:
+        _warn(
+            "image_to_file: Error while executing Tesseract, "
+            "returned error(s):\n{0}.".format(errors)
+        )
+
+
+async def _image_to_file_async(
+    image, output_filename_base, output_format, lang, config, tempfiles, deadline=None
+):
+    """
+    Core of the 'image_to_file_async' function.
+
+    The input file is prepared in the default executor of the running loop.
+    """
+    result = []
+    call_tempfiles = []
+
+    try:
+        job = await asyncio.to_thread(
+            _image_to_file_prepare,
+            image,
+            output_filename_base,
+            output_format,
+            lang,
+            config,
+            call_tempfiles,
+            "image_to_file_async",
+        )
+
+        if job:
+            command, out_file, output_format, input_data = job
+
+            status, output, err_string = await _proc_exec_wait_async(
+                command, input_data=input_data, deadline=deadline
+            )
+
+            result = _image_to_file_collect(
+                out_file, output_format, status, err_string, call_tempfiles
+            )
+            _keep_temp_files(status, call_tempfiles, tempfiles)
+            call_tempfiles = []
+    finally:
+        tempfiles.extend(call_tempfiles)
+
+    return result
+
+
+async def _image_to_file_cached_async(
+    image,
+    output_filename_base,
+    output_format,
+    lang,
+    config,
+    tempfiles,
+    deadline,
+    preprocess=None,
+):
+    """
+    '_image_to_file_async' checking the disk cache (if enabled) before preprocessing
+    the image (see '_preprocess_image') and processing it. Both run in the default
+    executor of the running loop.
+    """
+    steps = _parse_preprocess(preprocess) if preprocess else None
+    transform = None
+
+    if not _config.diskcache:
+        if steps:
+            pixels, config, transform = await asyncio.to_thread(
+                _preprocess_image, image, steps, config
+            )
+
+            # Blank pages have no text to extract
+            if pixels is None and image is not None:
+                return []
+
+            image = pixels
+
+        result = await _image_to_file_async(
+            _unwrap_image(image),
+            output_filename_base,
+            output_format,
+            lang,
+            config,
+            tempfiles,
+            deadline,
+        )
+
+        if transform:
+            await asyncio.to_thread(_map_output_files, result, transform)
+
+        return result
+
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return []
+
+    image, cache_key = await asyncio.to_thread(
+        _get_cache_key, image, output_format, None, lang, config, steps
+    )
+    result = await asyncio.to_thread(
+        _disk_cache_restore_files, cache_key, output_filename_base, tempfiles
+    )
+
+    if not result:
+        if steps:
+            pixels, config, transform = await asyncio.to_thread(
+                _preprocess_image, image, steps, config
+            )
+
+            # Blank pages have no text to extract
+            if pixels is None and image is not None:
+                return []
+
+            image = pixels
+
+        result = await _image_to_file_async(
+            _unwrap_image(image),
+            output_filename_base,
+            output_format,
+            lang,
+            config,
+            tempfiles,
+            deadline,
+        )
+        await asyncio.to_thread(_map_output_files, result, transform)
+        await asyncio.to_thread(_disk_cache_put, cache_key, result)
+
+    return result
+
+
+async def _image_to_data_async(
+    image,
+    output_format,
+    data_output,
+    lang,
+    config,
+    deadline=None,
+    preprocess=None,
+    caller_name="image_to_data_async",
+):
+    """
+    Core of the 'image_to_data_async' function.
+
+    The result caches (if enabled) are checked before preprocessing (see
+    '_preprocess_image') and processing the image, the image is hashed and
+    preprocessed in the default executor of the running loop. 'caller_name'
+    prefixes the warnings of the languages check.
+    """
+    cache_key = None
+
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return None
+
+    if not _check_langs(lang, output_format, config, caller_name):
+        return None
+
+    steps = _parse_preprocess(preprocess) if preprocess else None
+
+    if _config.cacheentries or _config.diskcache or _config.coalescing:
+        image, cache_key, result = await asyncio.to_thread(
+            _cache_lookup, image, output_format, data_output, lang, config, steps
+        )
+
+        if result is not None:
+            return result
+
+    image = _unwrap_image(image)
+    args = (
+        cache_key,
+        image,
+        output_format,
+        data_output,
+        lang,
+        config,
+        steps,
+        deadline,
+    )
+
+    # Identical concurrent calls share a single processing
+    if cache_key is not None and _config.coalescing:
+        return await _coalesce_async(
+            cache_key, deadline, _image_to_data_async_run, *args
+        )
+
+    return await _image_to_data_async_run(*args)
+
+
+async def _image_to_data_async_run(
+    cache_key, image, output_format, data_output, lang, config, steps, deadline
+):
+    """
+    Preprocesses and processes the image of an 'image_to_data_async' call and
+    stores the result in the result caches.
+    """
+    pixels, transform = image, None
+
+    if steps:
+        pixels, config, transform = await asyncio.to_thread(
+            _preprocess_image, image, steps, config
+        )
+
+    # Blank pages have no text to extract
+    if pixels is None and image is not None:
+        result = []
+    else:
+        result = await _image_to_data_async_exec(
+            _unwrap_image(pixels),
+            output_format,
+            data_output,
+            lang,
+            config,
+            deadline,
+            transform,
+        )
+
+    if cache_key is not None:
+        await asyncio.to_thread(_cache_store, cache_key, result)
+
+    return result
+
+
+async def _image_to_data_async_exec(
+    image, output_format, data_output, lang, config, deadline, transform=None
+):
+    """
+    Processes the image of an 'image_to_data_async' call. The coordinates are
+    mapped through 'transform' if set (see '_map_output').
+
+    Temporary files are tracked per call and handed to the cleanup thread once the 
+    output files have been read, even if the call gets cancelled.
+    """
+    tempfiles = []
+
+    if _config.backend == Backend.LIB:
+        handled, result = await asyncio.to_thread(
+            _lib_image_to_data,
+            image,
+            output_format,
+            data_output,
+            lang,
+            config,
+            deadline,
+            transform,
+        )
+
+        if handled:
+            return result
+
+    try:
+        # A single output format is read from the standard output
+        if len(output_format) == 1:
+            job = await asyncio.to_thread(
+                _image_to_file_prepare,
+                image,
+                "stdout",
+                output_format,
+                lang,
+                config,
+                tempfiles,
+                "image_to_data_async",
+            )
+
+            if not job:
+                return None
+
+            status, output, err_string = await _proc_exec_wait_async(
+                job[0], input_data=job[3], deadline=deadline
+            )
+
+            return _read_output_stdout(
+                output, output_format[0], status, err_string, data_output, transform
+            )
+
+        out_files = await _image_to_file_async(
+            image, None, output_format, lang, config, tempfiles, deadline
+        )
+
+        return await asyncio.to_thread(
+            _read_output_files, out_files, data_output, transform
+        )
+    finally:
+        _defer_remove_temp_files(tempfiles)
+
+
+def _image_to_data(
+    image,
+    output_format,
+    data_output,
+    lang,
+    config,
+    tempfiles,
+    deadline=None,
+    preprocess=None,
+    caller_name="image_to_data",
+):
+    """
+    Core of the 'image_to_data' function.
+
+    The result caches (if enabled) are checked before preprocessing (see
+    '_preprocess_image') and processing the image. 'caller_name' prefixes the
+    warnings of the languages check.
+    """
+    cache_key = None
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return None
+
+    if not _check_langs(lang, output_format, config, caller_name):
+        return None
+
+    steps = _parse_preprocess(preprocess) if preprocess else None
+
+    if _config.cacheentries or _config.diskcache or _config.coalescing:
+        image, cache_key, result = _cache_lookup(
+            image, output_format, data_output, lang, config, steps
+        )
+
+        if result is not None:
+            return result
+
+    image = _unwrap_image(image)
+    args = (
+        cache_key,
+        image,
+        output_format,
+        data_output,
+        lang,
+        config,
+        tempfiles,
+        steps,
+    )
+
+    # Identical concurrent calls share a single processing
+    if cache_key is not None and _config.coalescing:
+        return _coalesce(cache_key, deadline, _image_to_data_run, *args, deadline)
+
+    return _image_to_data_run(*args, deadline)
+
+
+def _image_to_data_run(
+    cache_key,
+    image,
+    output_format,
+    data_output,
+    lang,
+    config,
+    tempfiles,
+    steps,
+    deadline,
+):
+    """
+    Preprocesses and processes the image of an 'image_to_data' call and stores the
+    result in the result caches.
+    """
+    pixels, config, transform = _preprocess_image(image, steps, config)
+
+    # Blank pages have no text to extract
+    if pixels is None and image is not None:
+        result = []
+    else:
+        result = _image_to_data_exec(
+            _unwrap_image(pixels),
+            output_format,
+            data_output,
+            lang,
+            config,
+            tempfiles,
+            deadline,
+            transform,
+        )
+
+    _cache_store(cache_key, result)
+
+    return result
+
+
+def _image_to_data_exec(
+    image, output_format, data_output, lang, config, tempfiles, deadline, transform=None
+):
+    """
+    Processes the image of an 'image_to_data' call. The coordinates are mapped
+    through 'transform' if set (see '_map_output').
+
+    A single output format is read from the Tesseract standard output, without any
+    output file. Otherwise, output files are read but not deleted, they are appended 
+    to 'tempfiles'.
+    """
+    if _config.backend == Backend.LIB:
+        handled, result = _lib_image_to_data(
+            image, output_format, data_output, lang, config, deadline, transform
+        )
+
+        if handled:
+            return result
+
+    if len(output_format) == 1:
+        # Image paths are read in memory to be handed to a warm standby process
+        if isinstance(image, str) and _standby_counts:
+            command = _build_command("stdin", "stdout", output_format, lang, config)
+
+            if tuple(command) in _standby_counts and os.path.isfile(image):
+                image = _read_file(image, True) or image
+
+        call_tempfiles = []
+
+        job = _image_to_file_prepare(
+            image,
+            "stdout",
+            output_format,
+            lang,
+            config,
+            call_tempfiles,
+            "image_to_data",
+        )
+
+        if not job:
+            tempfiles.extend(call_tempfiles)
+            return None
+
+        # Run the command and wait
+        status, output, err_string = _proc_exec_wait(
+            job[0], input_data=job[3], deadline=deadline
+        )
+        _keep_temp_files(status, call_tempfiles, tempfiles)
+
+        return _read_output_stdout(
+            output, output_format[0], status, err_string, data_output, transform
+        )
+
+    # Call '_image_to_file' function to get the output file(s) list
+    out_files = _image_to_file(
+        image, None, output_format, lang, config, tempfiles, deadline
+    )
+
+    return _read_output_files(out_files, data_output, transform)
+
+
+def _cache_lookup(image, output_format, data_output, lang, config, steps=None):
+    """
+    Returns an (image, key, result) tuple where 'result' is the cached result of the
+    given 'image_to_data' parameters, None if there's none.
+
+    The in-memory cache is checked first, then the disk cache.
+    """
+    result = None
+    image, key = _get_cache_key(image, output_format, data_output, lang, config, steps)
+
+    if key is not None:
+        result = _result_cache_get(key)
+
+        if result is None and _config.diskcache:
+            result = _disk_cache_get(key)
+            _result_cache_put(key, result)
+
+    return (image, key, result)
+
+
+def _cache_store(key, result):
+    """
+    Stores the given 'image_to_data' result in both the in-memory and disk caches.
+    """
+    _result_cache_put(key, result)
+    _disk_cache_put(key, result)
+
+
+def _get_cache_key(image, output_format, data_output, lang, config, steps=None):
+    """
+    Returns an (image, key) tuple where 'key' is the result cache key of the given
+    'image_to_data' parameters, or None if the image can't be cached. 'data_output'
+    equals None for 'image_to_file' calls. 'steps' holds the preprocessing steps
+    (see '_parse_preprocess'), the key is built from the image before preprocessing.
+
+    File-like objects and images which have no raw pixel buffer are read <or>
+    encoded once, the returned image then holds the read data. Prepared images are
+    returned unwrapped.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    prepared = image if isinstance(image, TessyPreparedImage) else None
+    image = _unwrap_image(image)
+
+    if prepared and prepared.closed:
+        return (image, None)
+
+    # The content of a prepared image data never changes
+    if prepared and prepared._digest:
+        digest = None
+    elif isinstance(image, str):
+        # Text files hold the paths of other images which may change
+        if image.lower().endswith(".txt") or not os.path.isfile(image):
+            return (image, None)
+
+        try:
+            with open(image, "rb") as f:
+                digest = hashlib.file_digest(f, lambda: digest)
+        except OSError:
+            return (image, None)
+    else:
+        is_data = _is_image_data(image)
+        lib = None if is_data else _get_image_lib_name_from_object(image)
+
+        # Unsupported images are left to the regular processing (and warnings)
+        if not is_data and not lib:
+            return (image, None)
+
+        if not _hash_image_pixels(image, lib[0] if lib else None, digest):
+            data = _prepare_input_data(image)
+
+            if data is None:
+                return (image, None)
+
+            image = data
+            digest.update(image)
+
+        if prepared:
+            prepared._digest = digest.digest()
+
+    lang = _resolve_lang(lang) if lang else None
+    steps = tuple(
+        (name, tuple(sorted(options.items()))) for name, f, options in steps or ()
+    )
+
+    key = (
+        prepared._digest if digest is None else digest.digest(),
+        output_format,
+        data_output,
+        lang,
+        config,
+        steps,
+        _config.backend,
+        _config.datadir,
+        _config.command,
+        _get_command_version(),
+        _get_traineddata_stamp(lang, output_format),
+    )
+
+    return (image, key)
+
+
+def _get_traineddata_stamp(lang, output_format):
+    """
+    Returns the (name, modification time, size) of each language data file used to
+    process the given language(s) and output format(s), so updated files change 
+    the cache keys.
+    """
+    result = []
+    datadir = _config.datadir or os.environ.get("TESSDATA_PREFIX")
+    names = (lang or "eng").split("+")
+
+    if "osd" in output_format:
+        names.append("osd")
+
+    for name in names:
+        stamp = None
+
+        if datadir:
+            for data_path in (datadir, os.path.join(datadir, "tessdata")):
+                try:
+                    stat = os.stat(os.path.join(data_path, name + ".traineddata"))
+                    stamp = (name, stat.st_mtime_ns, stat.st_size)
+                    break
+                except OSError:
+                    pass
+
+        result.append(stamp or (name,))
+
+    return tuple(result)
+
+
+def _hash_image_pixels(image, img_lib_name, digest):
+    """
+    Updates 'digest' with the raw pixels (and their layout) of the given image 
+    object.
+
+    Returns False if the raw pixels of the image can't be read.
+    """
+    result = True
+
+    try:
+        if img_lib_name == "cv":
+            digest.update("{0}{1}".format(image.shape, image.dtype.str).encode())
+            digest.update(
+                image.data if image.flags["C_CONTIGUOUS"] else image.tobytes()
+            )
+        elif img_lib_name == "pil":
+            digest.update("{0}{1}".format(image.mode, image.size).encode())
+            digest.update(image.tobytes())
+        elif img_lib_name == "wx":
+            digest.update("{0}{1}".format(image.GetWidth(), image.GetHeight()).encode())
+            digest.update(image.GetData())
+
+            if image.HasAlpha():
+                digest.update(image.GetAlpha())
+        else:
+            result = False
+    except Exception:
+        result = False
+
+    return result
+
+
+def _get_command_version():
+    """
+    Returns the version string of the current Tesseract command (see '_get_probe').
+    """
+    probe = _get_probe()
+    return probe["version"] if probe else None
+
+
+def _result_cache_get(key):
+    """
+    Returns a copy of the cached result of the given key, None if there's none.
+    """
+    if key is None or not _config.cacheentries:
+        return None
+
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+
+        if entry is None:
+            _result_cache_stats["misses"] += 1
+            return None
+
+        _result_cache.move_to_end(key)
+        _result_cache_stats["hits"] += 1
+
+    return _copy_result(entry[0], key[2])
+
+
+def _copy_result(result, data_output):
+    """
+    Returns a copy of the given 'image_to_data' result.
+    """
+    if result is None:
+        return None
+
+    # Dictionaries are mutable, each call gets its own copy
+    return copy.deepcopy(result) if data_output == DataOutput.DICT else list(result)
+
+
+def _result_cache_put(key, result):
+    """
+    Stores the given result in the result cache and evicts the least recently used 
+    results if needed.
+    """
+    if key is None or result is None:
+        return
+
+    size = sum(
+        len(data) if isinstance(data, (str, bytes)) else len(str(data))
+        for data in result
+    )
+
+    if size > _config.cachebytes:
+        return
+
+    with _result_cache_lock:
+        old_entry = _result_cache.pop(key, None)
+
+        if old_entry:
+            _result_cache_stats["bytes"] -= old_entry[1]
+
+        _result_cache[key] = (_copy_result(result, key[2]), size)
+        _result_cache_stats["bytes"] += size
+
+    _result_cache_evict()
+
+
+def _result_cache_evict():
+    """
+    Evicts the least recently used results until the result cache fits its limits.
+    """
+    with _result_cache_lock:
+        while _result_cache and (
+            len(_result_cache) > _config.cacheentries
+            or _result_cache_stats["bytes"] > _config.cachebytes
+        ):
+            key, entry = _result_cache.popitem(last=False)
+            _result_cache_stats["bytes"] -= entry[1]
+            _result_cache_stats["evictions"] += 1
+
+
+def _coalesce(key, deadline, func, *args):
+    """
+    Calls 'func' with the given arguments and returns its result, unless a call
+    with the same key is already in progress: its result is then awaited until 
+    'deadline' and a copy is returned.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leading = future is None
+
+        if leading:
+            future = _inflight[key] = concurrent.futures.Future()
+
+    if leading:
+        try:
+            result = func(*args)
+        except BaseException as e:
+            _coalesce_finish(key, future, error=e)
+            raise
+
+        _coalesce_finish(key, future, result)
+        return result
+
+    try:
+        result = future.result(_get_remaining_time(deadline))
+    except concurrent.futures.CancelledError:
+        return _coalesce(key, deadline, func, *args)
+    except concurrent.futures.TimeoutError:
+        _warn(
+            "image_to_data: Timed out while waiting for an identical call.",
+            TessyTimeoutWarning,
+        )
+        return None
+
+    return _coalesce_result(result, key)
+
+
+async def _coalesce_async(key, deadline, func, *args):
+    """
+    Coroutine version of '_coalesce', 'func' being a coroutine function.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leading = future is None
+
+        if leading:
+            future = _inflight[key] = concurrent.futures.Future()
+
+    if leading:
+        try:
+            result = await func(*args)
+        except BaseException as e:
+            _coalesce_finish(key, future, error=e)
+            raise
+
+        _coalesce_finish(key, future, result)
+        return result
+
+    # Waiting doesn't cancel the shared future, even if this task gets cancelled
+    waiter = asyncio.wrap_future(future)
+    await asyncio.wait([waiter], timeout=_get_remaining_time(deadline))
+
+    if future.cancelled():
+        return await _coalesce_async(key, deadline, func, *args)
+
+    if not future.done():
+        _warn(
+            "image_to_data_async: Timed out while waiting for an identical call.",
+            TessyTimeoutWarning,
+        )
+        return None
+
+    return _coalesce_result(future.result(), key)
+
+
+def _coalesce_finish(key, future, result=None, error=None):
+    """
+    Removes the given in-progress call and hands its result <or> error to the 
+    waiting calls.
+
+    The waiting calls process the image themselves if the error isn't an 
+    'Exception' (e.g.: the call got interrupted <or> cancelled).
+    """
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+    if error is None:
+        future.set_result(result)
+    elif isinstance(error, Exception):
+        future.set_exception(error)
+    else:
+        future.cancel()
+
+
+def _coalesce_result(result, key):
+    """
+    Returns a copy of the result of a shared call, warns if the call failed.
+    """
+    if result is None:
+        _warn("image_to_data: An identical concurrent call failed.")
+
+    return _copy_result(result, key[2])
+
+
+def _disk_cache_get(key):
+    """
+    Returns the result stored by the disk cache for the given key, None if there's 
+    none.
+
+    Results of 'image_to_file' calls are returned as a list of (format, bytes).
+    """
+    result = None
+    entry_path = _disk_cache_path(key)
+
+    if entry_path is None:
+        return result
+
+    try:
+        stat = os.stat(entry_path)
+
+        if _config.diskcacheage and time.time() - stat.st_mtime > _config.diskcacheage:
+            _disk_cache_remove(entry_path)
+        else:
+            with open(entry_path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+            if key[2] is None:
+                result = [(fmt, base64.b64decode(data)) for fmt, data in entry]
+            elif key[2] == DataOutput.BYTES:
+                result = [base64.b64decode(data) for data in entry]
+            else:
+                result = entry
+
+            # The modification time tracks the last use of the entry
+            os.utime(entry_path)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, zlib.error):
+        result = None
+        _disk_cache_remove(entry_path)
+
+    with _disk_cache_lock:
+        _disk_cache_stats["hits" if result is not None else "misses"] += 1
+
+    return result
+
+
+def _disk_cache_put(key, result):
+    """
+    Stores the given result in the disk cache, atomically.
+
+    Results of 'image_to_file' calls are given as the list of output files.
+    """
+    entry_path = _disk_cache_path(key)
+
+    if entry_path is None or not result:
+        return
+
+    try:
+        # Bytes are stored as base64 strings
+        if key[2] is None:
+            entry = []
+
+            for fp in result:
+                with open(fp, "rb") as f:
+                    file_data = base64.b64encode(f.read()).decode("ascii")
+
+                entry.append((os.path.splitext(fp)[1][1:], file_data))
+        elif key[2] == DataOutput.BYTES:
+            entry = [base64.b64encode(data).decode("ascii") for data in result]
+        else:
+            entry = result
+
+        data = zlib.compress(json.dumps(entry).encode("utf-8"))
+
+        # Concurrent writers each rename their own complete file over the entry
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        temp_path = "{0}.{1}.tmp".format(entry_path, _get_temp_file_name())
+
+        with open(temp_path, "wb") as f:
+            f.write(data)
+
+        os.replace(temp_path, entry_path)
+    except (OSError, TypeError, ValueError) as e:
+        _warn("_disk_cache_put: Could not write the cache entry. Error: {0}.".format(e))
+        return
+
+    with _disk_cache_lock:
+        _disk_cache_stats["writes"] += 1
+        _disk_cache_stats["pending"] += len(data)
+
+        # Prune the cache in the background every 1/8 of its size written
+        prune = _disk_cache_stats["pending"] > _config.diskcachebytes // 8
+
+        if prune:
+            _disk_cache_stats["pending"] = 0
+
+    if prune:
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_disk_cache_prune,),
+            daemon=True,
+        ).start()
+
+
+def _disk_cache_restore_files(key, output_filename_base, tempfiles):
+    """
+    Writes the output files of an 'image_to_file' call stored by the disk cache and
+    returns their list, empty if there's no entry for the given key.
+    """
+    result = []
+    entry = _disk_cache_get(key)
+
+    if not entry:
+        return result
+
+    out_file = (
+        _get_temp_path() if output_filename_base is None else output_filename_base
+    )
+
+    try:
+        for fmt, data in entry:
+            fp = "{0}.{1}".format(out_file, fmt)
+
+            with open(fp, "wb") as f:
+                f.write(data)
+
+            result.append(fp)
+    except OSError as e:
+        _warn(
+            "image_to_file: Could not write the cached output file.\n"
+            "OS Error ({0}): {1}.".format(e.errno, e.strerror)
+        )
+
+    tempfiles.extend(result)
+
+    return result
+
+
+def _disk_cache_path(key):
+    """
+    Returns the path of the disk cache entry of the given key, None if the disk 
+    cache is disabled. Entries are sharded by the first byte of their hash.
+    """
+    if key is None or not _config.diskcache:
+        return None
+
+    name = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=20).hexdigest()
+
+    return os.path.join(_config.diskcache, name[:2], name + ".z")
+
+
+def _disk_cache_prune(remove_all=False):
+    """
+    Removes the expired entries of the disk cache, then the least recently used 
+    ones until the cache fits its size limit.
+
+    If 'remove_all' is set to True, all the entries are removed.
+    """
+    cache_dir, max_age = _config.diskcache, _config.diskcacheage
+
+    if not cache_dir or not _disk_cache_prune_lock.acquire(blocking=remove_all):
+        return
+
+    try:
+        entries = []
+        now = time.time()
+
+        # Only the entries of the 256 shard directories are considered
+        for shard in os.scandir(cache_dir):
+            if len(shard.name) != 2 or not shard.is_dir():
+                continue
+
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith((".z", ".tmp")):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                age = now - stat.st_mtime
+
+                # Leftovers of interrupted writes
+                if entry.name.endswith(".tmp"):
+                    if remove_all or age > 3600:
+                        _disk_cache_remove(entry.path)
+                elif remove_all or (max_age and age > max_age):
+                    _disk_cache_remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(entry[1] for entry in entries)
+
+        for mtime, size, entry_path in sorted(entries):
+            if total_size <= _config.diskcachebytes:
+                break
+
+            _disk_cache_remove(entry_path)
+            total_size -= size
+    except OSError:
+        pass
+    finally:
+        _disk_cache_prune_lock.release()
+
+
+def _disk_cache_remove(entry_path):
+    """
+    Removes the given disk cache file, silently: another process may have removed 
+    it already.
+    """
+    try:
+        os.remove(entry_path)
+    except OSError:
+        pass
+
+
+def _read_output_files(out_files, data_output, transform=None):
+    """
+    Reads and converts the content of each given output file according to 
+    'data_output'. The coordinates are mapped through 'transform' if set (see
+    '_map_output').
+
+    Returns None if 'out_files' is empty.
+    """
+    result = None
+
+    if out_files and len(out_files) > 0:
+        result = []
+
+        for fp in out_files:
+            file_data = _read_file(fp, data_output == DataOutput.BYTES)
+            file_ext = os.path.splitext(fp)[1][1:]
+
+            if file_data and transform:
+                file_data = _map_output(file_data, file_ext, transform)
+
+            if file_data:
+                if data_output == DataOutput.DICT:
+                    file_data = _data_to_dict(file_data, file_ext)
+
+                result.append(file_data)
+
+    return result
+
+
+def _data_to_dict(data, fmt):
+    """
+    Converts the given output data string to a dictionary according to its format.
+    """
+    todict_func = {
+        "txt": lambda d: {"data": d},
+        "tsv": lambda d: sv_to_dict(d),
+        "box": lambda d: boxes_to_dict(d),
+        "hocr": lambda d: hocr_to_dict(d),
+        "osd": lambda d: osd_to_dict(d),
+    }
+
+    return todict_func[fmt](data)
+
+
+def _image_to_data_list(
+    images,
+    output_format,
+    data_output,
+    lang,
+    config,
+    tempfiles,
+    deadline=None,
+    preprocess=None,
+    caller_name="image_to_data",
+):
+    """
+    Processes all the given images using a single Tesseract process through a list 
+    file and returns a list containing the converted data of each image.
+    'caller_name' prefixes the warnings of the languages check.
+
+    If 'preprocess' is set, each image is preprocessed first (see
+    '_preprocess_image'), the images are then processed together only if they get
+    the same resolution. Blank pages aren't processed and get an empty list.
+
+    Returns None if the images couldn't be processed together or if the combined 
+    output couldn't be split back into one result per image.
+    """
+    output_format = _parse_output_format(output_format)
+
+    if not output_format:
+        return None
+
+    # The OSD output contains no page information
+    if "osd" in output_format:
+        return None
+
+    _check_data_dir(config)
+
+    if not _check_langs(lang, output_format, config, caller_name):
+        return None
+
+    images_paths = []
+    transforms = []
+    blanks = []
+    group_config = config
+    steps = _parse_preprocess(preprocess) if preprocess else None
+
+    for idx, image in enumerate(map(_unwrap_image, images)):
+        pixels, image_config, transform = _preprocess_image(image, steps, config)
+
+        # Blank pages have no text to extract
+        if pixels is None and image is not None:
+            blanks.append(idx)
+            continue
+
+        image = pixels
+
+        transforms.append(transform)
+
+        if image_config != group_config:
+            if len(transforms) > 1:
+                return None
+
+            group_config = image_config
+
+        # Paths are written as is, other images are saved to a temp file first
+        if isinstance(image, str):
+            if not os.path.isfile(image):
+                return None
+
+            path = os.path.abspath(image)
+
+            # A list file holds one path per line
+            if "\n" not in path and "\r" not in path:
+                images_paths.append(path)
+                continue
+
+        in_file = _get_temp_path()
+
+        if not _prepare_input_file(image, in_file):
+            return None
+
+        tempfiles.append(in_file)
+        images_paths.append(in_file)
+
+    if not images_paths:
+        return [[] for idx in blanks]
+
+    list_file = _get_temp_path()
+
+    if not _write_file(list_file, "\n".join(images_paths)):
+        return None
+
+    tempfiles.append(list_file)
+
+    out_file = _get_temp_path()
+    command = _build_command(list_file, out_file, output_format, lang, group_config)
+
+    status, output, err_string = _proc_exec_wait(command, deadline=deadline)
+
+    out_files = _image_to_file_collect(
+        out_file, output_format, status, err_string, tempfiles
+    )
+
+    if not out_files:
+        return None
+
+    result = [[] for image in images_paths]
+
+    for fp in out_files:
+        file_data = _read_file(fp, True)
+        file_ext = os.path.splitext(fp)[1][1:]
+
+        if file_data is None:
+            return None
+
+        pages = _split_pages(file_data.decode("utf-8"), file_ext, len(images_paths))
+
+        if pages is None:
+            _warn(
+                "_image_to_data_list: Unable to split the '{0}' output "
+                "into {1} page(s).".format(file_ext, len(images_paths))
+            )
+            return None
+
+        for idx, page in enumerate(pages):
+            page = _map_output(page, file_ext, transforms[idx])
+
+            page_data = (
+                page.encode("utf-8")
+                if data_output == DataOutput.BYTES
+                else page.strip()
+            )
+
+            if page_data:
+                if data_output == DataOutput.DICT:
+                    page_data = _data_to_dict(page_data, file_ext)
+
+                result[idx].append(page_data)
+
+    for idx in blanks:
+        result.insert(idx, [])
+
+    return result
+
+
+def _split_pages(data, fmt, page_count):
+    """
+    Splits the combined 'fmt' output of a list file invocation into 'page_count' 
+    pages.
+
+    Page numbers of the 'tsv', 'box' and 'hocr' pages are renumbered as if each page
+    had been processed alone.
+
+    Returns None if the output doesn't hold exactly 'page_count' pages <or> if it's
+    malformed.
+    """
+    result = None
+
+    try:
+        # Each page is followed by a form feed
+        if fmt == "txt":
+            pages = data.split("\f")
+
+            if pages and not pages[-1].strip():
+                pages.pop()
+
+            if len(pages) == page_count:
+                result = pages
+
+        # Rows are grouped by the 'page_num' column (1-based)
+        elif fmt == "tsv":
+            lines = data.splitlines()
+
+            if lines:
+                header = lines.pop(0)
+                page_col = header.split("\t").index("page_num")
+                pages = [[header] for page in range(0, page_count)]
+
+                for line in lines:
+                    cells = line.split("\t")
+                    page_num = int(cells[page_col])
+
+                    if page_num < 1 or page_num > page_count:
+                        return None
+
+                    cells[page_col] = "1"
+                    pages[page_num - 1].append("\t".join(cells))
+
+                result = ["\n".join(page) for page in pages]
+
+        # Boxes are grouped by their last column (0-based page number)
+        elif fmt == "box":
+            pages = [[] for page in range(0, page_count)]
+
+            for line in data.splitlines():
+                box, page_num = line.rsplit(" ", 1)
+                page_num = int(page_num)
+
+                if page_num < 0 or page_num >= page_count:
+                    return None
+
+                pages[page_num].append("{0} 0".format(box))
+
+            result = ["\n".join(page) for page in pages]
+
+        # Each page is held by an 'ocr_page' div, the document head and tail are
+        # shared by all pages
+        elif fmt == "hocr":
+            starts = [m.start() for m in re.finditer("<div class=.ocr_page.", data)]
+            end = data.rfind("</body>")
+
+            if len(starts) == page_count and end >= 0:
+                head = data[: starts[0]]
+                tail = data[end:]
+                bounds = starts + [end]
+
+                result = [
+                    head + _renumber_hocr_page(data[start:stop], idx) + tail
+                    for idx, (start, stop) in enumerate(zip(bounds, bounds[1:]))
+                ]
+    except (ValueError, IndexError):
+        return None
+
+    return result
+
+
+def _renumber_hocr_page(data, page_idx):
+    """
+    Returns the given 'ocr_page' div of an hOCR document with its 'ppageno' (0-based)
+    and the page number of its element ids (1-based, *e.g.*: 'word_2_5') set as if
+    the page at 'page_idx' had been processed alone.
+    """
+    data = re.sub(r"\bppageno {0}\b".format(page_idx), "ppageno 0", data)
+
+    return re.sub(
+        r"(\bid=['\"][a-z]+_){0}(?=['\"_])".format(page_idx + 1), r"\g<1>1", data
+    )
+
+
+def _lib_image_to_data(
+    image, output_format, data_output, lang, config, deadline=None, transform=None
+):
+    """
+    'image_to_data' using the in-process libtesseract backend. The coordinates are
+    mapped through 'transform' if set (see '_map_output').
+
+    The recognition is cancelled by libtesseract itself once 'deadline' expires.
+
+    Returns a (handled, result) tuple. 'handled' equals False if the call can't be 
+    processed in-process and must fall back to the Tesseract command.
+    """
+    result = None
+
+    if not _load_lib() or not set(output_format) <= {"txt", "tsv", "hocr", "box"}:
+        return (False, result)
+
+    options = _parse_lib_config(config)
+
+    if options is None:
+        return (False, result)
+
+    datadir, oem, psm, dpi, variables = options
+
+    # The image must be decoded by Leptonica if its pixels can't be read directly
+    pixels = _get_image_pixels(image)
+
+    if pixels is None and "lept" not in _lib:
+        return (False, result)
+
+    _check_data_dir(config)
+
+    if not _check_langs(lang, output_format, config, "image_to_data"):
+        return (True, result)
+
+    handle = _get_lib_handle(
+        datadir or _config.datadir,
+        _resolve_lang(lang) if lang else "eng",
+        oem,
+        variables,
+    )
+
+    if handle is None:
+        return (True, result)
+
+    tess = _lib["tess"]
+    pix = None
+    monitor = None
+
+    try:
+        tess.TessBaseAPISetPageSegMode(handle, psm)
+
+        if pixels is not None:
+            data, width, height, bpp, bpl = pixels
+            tess.TessBaseAPISetImage(handle, data, width, height, bpp, bpl)
+        else:
+            data = _prepare_input_data(image)
+
+            if data is None:
+                return (True, result)
+
+            data = bytes(data)
+            pix = _lib["lept"].pixReadMem(data, len(data))
+
+            if not pix:
+                _warn("image_to_data: (libtesseract) Unable to decode the image.")
+                return (True, result)
+
+            tess.TessBaseAPISetImage2(handle, pix)
+
+        # The resolution of the previous image is never kept by the reused handle
+        if not dpi and pix:
+            dpi = _lib["lept"].pixGetYRes(pix)
+
+        tess.TessBaseAPISetSourceResolution(handle, dpi)
+
+        if deadline is not None:
+            monitor = tess.TessMonitorCreate()
+            tess.TessMonitorSetDeadlineMSecs(
+                monitor, max(0, int(_get_remaining_time(deadline) * 1000))
+            )
+
+        if tess.TessBaseAPIRecognize(handle, monitor) != 0:
+            if deadline is not None and _get_remaining_time(deadline) <= 0:
+                _warn(
+                    "image_to_data: (libtesseract) The recognition timed out and "
+                    "has been cancelled.",
+                    TessyTimeoutWarning,
+                )
+            else:
+                _warn("image_to_data: (libtesseract) Unable to recognize the image.")
+
+            return (True, result)
+
+        result = []
+
+        for fmt in output_format:
+            output = _map_output(_get_lib_text(handle, fmt), fmt, transform)
+
+            output_data = (
+                output.encode("utf-8")
+                if data_output == DataOutput.BYTES
+                else output.strip()
+            )
+
+            if output_data:
+                if data_output == DataOutput.DICT:
+                    output_data = _data_to_dict(output_data, fmt)
+
+                result.append(output_data)
+    finally:
+        tess.TessBaseAPIClear(handle)
+
+        if monitor:
+            tess.TessMonitorDelete(monitor)
+
+        if pix:
+            _lib["lept"].pixDestroy(ctypes.byref(ctypes.c_void_p(pix)))
+
+    return (True, result)
+
+
+def _load_lib():
+    """
+    Loads the libtesseract library (and Leptonica, if available) and declares the 
+    used C API functions.
+
+    Returns True if libtesseract is loaded. The loading is only attempted once.
+    """
+    if "tess" in _lib:
+        return _lib["tess"] is not None
+
+    with _lib_lock:
+        if "tess" in _lib:
+            return _lib["tess"] is not None
+
+        tess = _open_lib(
+            _config.libpath,
+            "tesseract",
+            ("libtesseract.so.5", "libtesseract.so.4", "libtesseract-5.dll"),
+        )
+        lept = None
+
+        if tess:
+            c_int, c_ptr, c_str = ctypes.c_int, ctypes.c_void_p, ctypes.c_char_p
+
+            for name, restype, argtypes in (
+                ("TessBaseAPICreate", c_ptr, []),
+                ("TessBaseAPIDelete", None, [c_ptr]),
+                ("TessBaseAPIEnd", None, [c_ptr]),
+                ("TessBaseAPIInit2", c_int, [c_ptr, c_str, c_str, c_int]),
+                ("TessBaseAPISetVariable", c_int, [c_ptr, c_str, c_str]),
+                ("TessBaseAPISetPageSegMode", None, [c_ptr, c_int]),
+                ("TessBaseAPISetImage", None, [c_ptr] + [c_ptr] + [c_int] * 4),
+                ("TessBaseAPISetImage2", None, [c_ptr, c_ptr]),
+                ("TessBaseAPISetSourceResolution", None, [c_ptr, c_int]),
+                ("TessBaseAPIRecognize", c_int, [c_ptr, c_ptr]),
+                ("TessBaseAPIGetUTF8Text", c_ptr, [c_ptr]),
+                ("TessBaseAPIGetTsvText", c_ptr, [c_ptr, c_int]),
+                ("TessBaseAPIGetHOCRText", c_ptr, [c_ptr, c_int]),
+                ("TessBaseAPIGetBoxText", c_ptr, [c_ptr, c_int]),
+                ("TessBaseAPIClear", None, [c_ptr]),
+                ("TessDeleteText", None, [c_ptr]),
+                ("TessMonitorCreate", c_ptr, []),
+                ("TessMonitorDelete", None, [c_ptr]),
+                ("TessMonitorSetDeadlineMSecs", None, [c_ptr, c_int]),
+            ):
+                func = getattr(tess, name)
+                func.restype = restype
+                func.argtypes = argtypes
+
+            lept = _open_lib(
+                None,
+                "leptonica",
+                ("libleptonica.so.6", "liblept.so.5", "liblept-5.dll"),
+            )
+
+            if lept:
+                lept.pixReadMem.restype = c_ptr
+                lept.pixReadMem.argtypes = [c_ptr, ctypes.c_size_t]
+                lept.pixDestroy.restype = None
+                lept.pixDestroy.argtypes = [c_ptr]
+                lept.pixGetYRes.restype = c_int
+                lept.pixGetYRes.argtypes = [c_ptr]
+
+        _lib["lept"] = lept
+        _lib["tess"] = tess
+
+    return tess is not None
+
+
+def _open_lib(lib_path, lib_name, fallback_names):
+    """
+    Opens and returns the given shared library, None if it can't be found.
+
+    The library is searched using its path (if given), its name in the system paths,
+    the given fallback file names and the Tesseract command directory.
+    """
+    candidates = [lib_path] if lib_path else []
+    candidates.append(ctypes.util.find_library(lib_name))
+    candidates.extend(fallback_names)
+
+    cmd_path = os.path.dirname(_config.command)
+
+    if cmd_path:
+        candidates.extend(os.path.join(cmd_path, name) for name in fallback_names)
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+
+        try:
+            return ctypes.CDLL(candidate)
+        except (OSError, AttributeError):
+            pass
+
+    return None
+
+
+def _parse_lib_config(config):
+    """
+    Parses the 'config' parameters supported by the libtesseract backend.
+
+    Returns a (datadir, oem, psm, dpi, variables) tuple or None if 'config' holds 
+    any unsupported parameter.
+    """
+    datadir, oem, psm, dpi, variables = None, 3, 3, 0, ()
+
+    try:
+        args = _split_config(config) if config else []
+        idx = 0
+
+        if args is None:
+            return None
+
+        while idx < len(args):
+            arg, value = args[idx], args[idx + 1]
+
+            if arg == "--tessdata-dir":
+                datadir = value
+            elif arg == "--oem":
+                oem = int(value)
+            elif arg == "--psm":
+                psm = int(value)
+            elif arg == "--dpi":
+                dpi = int(value)
+            elif arg == "-c" and "=" in value:
+                variables += (tuple(value.split("=", 1)),)
+            else:
+                return None
+
+            idx += 2
+    except (ValueError, IndexError):
+        return None
+
+    return (datadir, oem, psm, dpi, variables)
+
+
+def _get_lib_handle(datadir, lang, oem, variables):
+    """
+    Returns the libtesseract engine handle of the current thread for the given 
+    parameters, creating and initializing it if needed.
+
+    Returns None if the engine can't be initialized.
+    """
+    handles = getattr(_lib_local, "handles", None)
+
+    if handles is None:
+        handles = _lib_local.handles = {}
+
+    key = (datadir, lang, oem, variables)
+
+    if key in handles:
+        return handles[key].handle
+
+    tess = _lib["tess"]
+    handle = tess.TessBaseAPICreate()
+    datadir_arg = datadir.encode("utf-8") if datadir else None
+
+    if tess.TessBaseAPIInit2(handle, datadir_arg, lang.encode("utf-8"), oem) != 0:
+        tess.TessBaseAPIDelete(handle)
+        _warn(
+            "image_to_data: (libtesseract) Unable to initialize the engine using the "
+            "language(s) '{0}'.".format(lang)
+        )
+        return None
+
+    for name, value in variables:
+        tess.TessBaseAPISetVariable(handle, name.encode("utf-8"), value.encode("utf-8"))
+
+    handles[key] = _LibHandle(handle)
+
+    return handle
+
+
+class _LibHandle(object):
+    """
+    Owns a libtesseract engine handle and releases it once garbage collected
+    (*e.g.*: when its thread ends).
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def __del__(self):
+        # The module globals may already be cleared at interpreter exit
+        tess = _lib.get("tess") if _lib else None
+
+        if tess and self.handle:
+            tess.TessBaseAPIEnd(self.handle)
+            tess.TessBaseAPIDelete(self.handle)
+            self.handle = None
+
+
+def _get_image_pixels(image):
+    """
+    Returns a (data, width, height, bytes per pixel, bytes per line) tuple giving 
+    direct access to the 8-bit pixels of the given image object.
+
+    The pixels are read the same way as the encoded images (see '_get_image_buffer').
+
+    Returns None if the image pixels can't be accessed directly.
+    """
+    img_lib = _get_image_lib_name_from_object(image)
+    img_mod = _import_image_module(img_lib[0]) if img_lib else None
+
+    try:
+        pixels = _get_image_buffer(image, img_lib[0], img_mod) if img_mod else None
+    except Exception:
+        pixels = None
+
+    if pixels is None:
+        return None
+
+    data, width, height, bpp = pixels
+
+    # The returned pointer keeps a reference to the array
+    if hasattr(data, "ctypes"):
+        data = data.ctypes.data_as(ctypes.c_void_p)
+    elif not isinstance(data, bytes):
+        data = bytes(data)
+
+    return (data, width, height, bpp, width * bpp)
+
+
+def _get_lib_text(handle, fmt):
+    """
+    Returns the recognized text of the given engine handle in the given format, as 
+    formatted by the Tesseract command.
+    """
+    tess = _lib["tess"]
+
+    if fmt == "tsv":
+        text_ptr = tess.TessBaseAPIGetTsvText(handle, 0)
+    elif fmt == "hocr":
+        text_ptr = tess.TessBaseAPIGetHOCRText(handle, 0)
+    elif fmt == "box":
+        text_ptr = tess.TessBaseAPIGetBoxText(handle, 0)
+    else:
+        text_ptr = tess.TessBaseAPIGetUTF8Text(handle)
+
+    try:
+        text = ctypes.string_at(text_ptr).decode("utf-8") if text_ptr else ""
+    finally:
+        if text_ptr:
+            tess.TessDeleteText(text_ptr)
+
+    # The C API returns the page content only, without the document header/footer
+    if fmt == "tsv":
+        text = (
+            "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+            "left\ttop\twidth\theight\tconf\ttext\n"
+        ) + text
+    elif fmt == "hocr":
+        text = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            " <head>\n"
+            "  <title></title>\n"
+            '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+            "  <meta name='ocr-system' content='tesseract' />\n"
+            " </head>\n"
+            " <body>\n{0} </body>\n</html>\n"
+        ).format(text)
+
+    return text
+
+
+def _batch_map(func, images, workers, pool, caller_name):
+    """
+    Runs 'func' over each image of 'images' using a thread or process pool and 
+    returns the results in the same order as the input.
+    """
+    result = []
+
+    # Both pools get the documented default, their own defaults differ
+    workers = workers or os.cpu_count() or 1
+    config_values = (
+        _config.command,
+        _config.datadir,
+        _config.contentsep,
+        _config.timeout,
+    )
+
+    if pool == Pool.THREAD:
+        # Threads share the module state, a single initialization is enough
+        _batch_init(config_values)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+        # Workers use the configuration of the calling session
+        func = functools.partial(_run_with_config, _config_var.get(), func)
+    elif pool == Pool.PROCESS:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_batch_init,
+            initargs=(config_values,),
+        )
+    else:
+        _warn(
+            "{0}: Unsupported pool '{1}'. 'pool' must be either "
+            "'Pool.THREAD' or 'Pool.PROCESS'.".format(caller_name, pool)
+        )
+        return result
+
+    with executor:
+        result = list(executor.map(func, images))
+
+    return result
+
+
+def _run_with_config(config, func, *args):
+    """
+    Calls 'func' using the given session configuration in the current thread.
+    """
+    token = _config_var.set(config)
+
+    try:
+        return func(*args)
+    finally:
+        _config_var.reset(token)
+
+
+def _batch_init(config_values):
+    """
+    Initializes the current batch worker.
+
+    'config_values' holds the parent (command, datadir, contentsep, timeout)
+    configuration, which is always restored after 'init' (None to keep the current
+    one). 'init' is only called once per process.
+    """
+    global _batch_initialized
+
+    if not _batch_initialized:
+        _record_warnings(init)
+        _batch_initialized = True
+
+    if config_values:
+        (
+            _config.command,
+            _config.datadir,
+            _config.contentsep,
+            _config.timeout,
+        ) = config_values
+
+
+def _batch_image_to_data(
+    image, output_format, data_output, lang, config, timeout, preprocess=None
+):
+    """
+    Batch worker: 'image_to_data' for a single image of the batch.
+
+    Temporary files are tracked per call so concurrent workers never delete 
+    each other's files.
+    """
+    tempfiles = []
+
+    try:
+        return _record_warnings(
+            _image_to_data,
+            image,
+            output_format,
+            data_output,
+            lang,
+            config,
+            tempfiles,
+            _get_deadline(timeout, None),
+            preprocess,
+        )
+    finally:
+        _defer_remove_temp_files(tempfiles)
+
+
+def _batch_image_to_data_group(
+    images, output_format, data_output, lang, config, timeout, preprocess=None
+):
+    """
+    Batch worker: 'image_to_data' for a group of images processed by a single 
+    Tesseract process.
+
+    Falls back to processing each image individually if the group fails <or> raises
+    any warning, so each image only gets its own errors.
+    """
+    tempfiles = []
+    timeout = _config.timeout if timeout is None else timeout
+
+    # File-like images can only be read once, their data is kept for the fallback
+    images = [
+        _prepare_input_data(image) if _is_image_data(image) else image
+        for image in map(_unwrap_image, images)
+    ]
+
+    try:
+        data_list, errors = _record_warnings(
+            _image_to_data_list,
+            images,
+            output_format,
+            data_output,
+            lang,
+            config,
+            tempfiles,
+            _get_deadline(timeout * len(images) if timeout else None, None),
+            preprocess,
+        )
+    finally:
+        _defer_remove_temp_files(tempfiles)
+
+    if data_list is None or errors:
+        return [
+            _batch_image_to_data(
+                image, output_format, data_output, lang, config, timeout, preprocess
+            )
+            for image in images
+        ]
+
+    return [(data, errors) for data in data_list]
+
+
+def _data_to_string(data, errors):
+    """
+    Converts a (data, errors) batch result to a (string, errors) batch result.
+    """
+    return (_config.contentsep.join(data) if data else None, errors)
+
+
+def _chunks(iterable, size):
+    """
+    Yields successive lists of 'size' items from the given iterable.
+    """
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, size))
+
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+def _record_warnings(func, *args):
+    """
+    Calls 'func' with the given arguments and returns a (result, errors) tuple.
+
+    Warning messages raised by the module in the current thread are recorded 
+    instead of being displayed. An exception raised by 'func' is recorded as well
+    and makes the returned result None.
+    """
+    result = None
+    messages = []
+
+    _warn_records.messages = messages
+
+    try:
+        result = func(*args)
+    except Exception as e:
+        messages.append("{0}: {1}".format(type(e).__name__, e))
+        result = None
+    finally:
+        _warn_records.messages = None
+
+    return (result, "\n".join(messages) if messages else None)
+
+
+def _get_image_lib_name_from_object(obj):
+    """
+    Hackish way to determine from which image lib 'obj' come from
+    without importing each lib module individually.
+    """
+    result = ()
+
+    if obj is not None:
+        # PIL/Pillow Image
+        if hasattr(obj, "_close_exclusive_fp_after_loading"):
+            result = ("pil", "PIL/Pillow")
+        # wxPython Image
+        elif hasattr(obj, "FindFirstUnusedColour") and hasattr(
+            obj, "GetImageExtWildcard"
+        ):
+            result = ("wx", "wxPython")
+        # PyQt4, PyQt5 or PySide QImage
+        elif hasattr(obj, "createHeuristicMask") and hasattr(obj, "setDotsPerMeterX"):
+            result = ("qt", "PyQt(4-5)/PySide(1.x)")
+        # OpenCV Image (NumPy ndarray)
+        elif hasattr(obj, "argpartition") and hasattr(obj, "__array_interface__"):
+            result = ("cv", "NumPy/OpenCV")
+
+    return result
+
+
+def _import_image_module(mn):
+    """
+    Tries to import the corresponding image module and return it.
+
+    Modules won't be re-imported if they have already been cached.
+    """
+    global _image_modules
+
+    result = None
+
+    # Don't re-import existing cached modules
+    if mn in _image_modules and _image_modules[mn] is not None:
+        result = _image_modules[mn]
+    else:
+        # Import the 'Image' module from PIL
+        if mn == "pil":
+            try:
+                result = importlib.import_module("PIL.Image")
+            except (ImportError, RuntimeError):
+                pass
+
+        # Import wxPython
+        elif mn == "wx":
+            try:
+                result = importlib.import_module("wx")
+            except (ImportError, RuntimeError):
+                pass
+
+        # Import the 'QImage' module from PyQt5, PyQt4 or PySide
+        elif mn == "qt":
+            try:
+                result = importlib.import_module("PyQt5.QtGui").QImage
+            except (ImportError, RuntimeError):
+                try:
+                    result = importlib.import_module("PyQt4.QtGui").QImage
+                except (ImportError, RuntimeError):
+                    try:
+                        result = importlib.import_module("PySide.QtGui").QImage
+                    except ImportError:
+                        pass
+
+        # Import NumPy (OpenCV images are plain ndarrays)
+        elif mn == "cv":
+            try:
+                result = importlib.import_module("numpy")
+            except (ImportError, RuntimeError):
+                pass
+
+        if result:
+            _image_modules[mn] = result
+
+    return result
+
+
+def _prepare_image(image, img_lib_name, img_mod, img_save_path=None):
+    """
+    Encodes the given image object as a binary PGM/PPM image (see '_encode_pnm') and
+    returns its (header, pixels) tuple, None if the image couldn't be encoded.
+
+    If 'img_save_path' is set, the encoded image is also saved at the given save path
+    location, which can also be a writable binary file-like object.
+    """
+    try:
+        result = _encode_pnm(image, img_lib_name, img_mod)
+    except Exception as e:
+        _warn("_prepare_image: Unable to read the image pixels. Error: {0}.".format(e))
+        return None
+
+    if result is None:
+        _warn(
+            "_prepare_image: Unsupported image format. The image must hold 8-bit "
+            "grayscale, RGB or RGBA pixels (BGR or BGRA for OpenCV images)."
+        )
+    elif img_save_path is not None:
+        try:
+            if isinstance(img_save_path, str):
+                with open(img_save_path, "wb") as f:
+                    f.writelines(result)
+            else:
+                img_save_path.writelines(result)
+        except IOError as e:
+            _warn(
+                "_prepare_image: Could not save the image to '{0}'. "
+                "I/O Error ({1}): {2}.".format(img_save_path, e.errno, e.strerror)
+            )
+            result = None
+
+    return result
+
+
+def _encode_pnm(image, img_lib_name, img_mod):
+    """
+    Returns a (header, pixels) tuple holding the given image object as a binary PGM 
+    (grayscale) or PPM (RGB) image, None if its pixel format isn't supported.
+
+    The pixels buffer is shared with the image whenever possible (see 
+    '_get_image_buffer'), the header and pixels are meant to be written one after 
+    the other.
+
+    Binary ndarrays (True for white) are packed as 1-bit PBM images.
+    """
+    if img_lib_name == "cv" and str(image.dtype) == "bool" and image.ndim == 2:
+        header = "P4\n{0} {1}\n".format(image.shape[1], image.shape[0])
+        # Rotated views would give packed lines in their own memory order
+        pixels = img_mod.ascontiguousarray(img_mod.packbits(~image, axis=1))
+
+        return (header.encode("ascii"), memoryview(pixels).cast("B"))
+
+    pixels = _get_image_buffer(image, img_lib_name, img_mod)
+
+    if pixels is None:
+        return None
+
+    data, width, height, bpp = pixels
+    header = "P{0}\n{1} {2}\n255\n".format(5 if bpp == 1 else 6, width, height)
+
+    return (header.encode("ascii"), memoryview(data).cast("B"))
+
+
+def _get_image_buffer(image, img_lib_name, img_mod):
+    """
+    Returns a (buffer, width, height, bytes per pixel) tuple holding the 8-bit 
+    grayscale or RGB pixels of the given image object, without padding between lines.
+
+    The pixels are read straight from the image memory whenever its layout allows 
+    it. The image is only converted (copied) when its alpha channel has to be 
+    flattened onto a white background or when its pixels aren't stored as 8-bit 
+    grayscale or RGB lines (such as the BGR order of OpenCV).
+
+    Returns None if the pixel format isn't supported.
+    """
+    result = None
+
+    # OpenCV/NumPy (grayscale, BGR or BGRA ndarray)
+    if img_lib_name == "cv":
+        if str(image.dtype) == "bool":
+            image = image.astype("uint8") * 255
+
+        if image.ndim == 3 and image.shape[2] == 1:
+            image = image[:, :, 0]
+
+        if str(image.dtype) != "uint8":
+            return result
+
+        if image.ndim == 3 and image.shape[2] in (3, 4):
+            rgb_image = image[:, :, 2::-1]
+
+            if image.shape[2] == 4:
+                alpha = image[:, :, 3:]
+                rgb_image = 255 - (255 - rgb_image.astype("uint16")) * alpha // 255
+
+            image = rgb_image.astype("uint8")
+        elif image.ndim != 2:
+            return result
+
+        if not image.flags.c_contiguous:
+            image = image.copy()
+
+        result = (image, image.shape[1], image.shape[0], 1 if image.ndim == 2 else 3)
+
+    # Pillow
+    elif img_lib_name == "pil":
+        if image.mode not in ("L", "RGB"):
+            if "A" in image.getbands() or "transparency" in image.info:
+                rgba_image = image.convert("RGBA")
+                image = img_mod.new("RGB", image.size, (255, 255, 255))
+                image.paste(rgba_image, mask=rgba_image.getchannel("A"))
+            elif image.mode in ("1", "I", "I;16", "F"):
+                image = image.convert("L")
+            else:
+                image = image.convert("RGB")
+
+        width, height = image.size
+        result = (image.tobytes(), width, height, 1 if image.mode == "L" else 3)
+
+    # wxPython (the alpha channel is stored apart from the RGB data)
+    elif img_lib_name == "wx":
+        width, height = image.GetWidth(), image.GetHeight()
+        data = (
+            image.GetDataBuffer()
+            if hasattr(image, "GetDataBuffer")
+            else image.GetData()
+        )
+        result = (data, width, height, 3)
+
+    # PyQt/PySide
+    elif img_lib_name == "qt":
+        source = image
+        gray_format = getattr(img_mod, "Format_Grayscale8", None)
+
+        if image.hasAlphaChannel():
+            qt_gui = importlib.import_module(img_mod.__module__)
+            image = img_mod(source.size(), img_mod.Format_RGB888)
+            image.fill(qt_gui.QColor(255, 255, 255))
+            painter = qt_gui.QPainter(image)
+            painter.drawImage(0, 0, source)
+            painter.end()
+        elif image.format() not in (img_mod.Format_RGB888, gray_format):
+            image = image.convertToFormat(img_mod.Format_RGB888)
+
+        bpp = 1 if image.format() == gray_format else 3
+        width, height, bpl = image.width(), image.height(), image.bytesPerLine()
+        bits = image.constBits()
+
+        # PyQt returns a sized pointer
+        if hasattr(bits, "setsize"):
+            bits.setsize(bpl * height)
+
+        data = memoryview(bits)
+
+        # Lines are padded to 32 bits, a converted image must outlive the buffer
+        if bpl != width * bpp:
+            data = b"".join(
+                data[y * bpl : y * bpl + width * bpp] for y in range(height)
+            )
+        elif image is not source:
+            data = bytes(data)
+
+        result = (data, width, height, bpp)
+
+    return result
+
+
+def _preprocess_image(image, steps, config=None):
+    """
+    Returns an (image, config, transform) tuple where 'image' is the given image
+    preprocessed as an 8-bit grayscale, BGR <or> binary ndarray (see '_encode_pnm'),
+    None if the page is blank (see '_preprocess_crop').
+
+    'config' gets the resolution of the preprocessed image (--dpi) when it's known.
+    'transform' maps the coordinates of the preprocessed image back to the original
+    image (see '_map_output'), None if they match.
+
+    The image and config are returned as is if 'steps' is empty or if the image
+    couldn't be preprocessed. 'steps' holds the steps to apply in order (see
+    '_parse_preprocess').
+    """
+    if not steps:
+        return (image, config, None)
+
+    np = _import_image_module("cv")
+
+    if not np:
+        _warn("_preprocess_image: NumPy is required to preprocess the images.")
+        return (image, config, None)
+
+    start_time = time.perf_counter()
+    pixels, dpi = _get_image_array(np, image)
+    timings = {"decode": time.perf_counter() - start_time}
+
+    if pixels is None:
+        return (image, config, None)
+
+    input_bytes = pixels.nbytes
+    size = (pixels.shape[1], pixels.shape[0])
+
+    # Matrix mapping the coordinates of the current pixels to the original ones
+    layout = {
+        "matrix": (1.0, 0.0, 0.0, 0.0, 1.0, 0.0),
+        "dpi": dpi,
+        "config": config,
+        "blank": False,
+    }
+
+    for name, func, options in steps:
+        step_time = time.perf_counter()
+        pixels = func(np, pixels, layout, **options)
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - step_time
+
+        if layout["blank"]:
+            break
+
+    transform = None
+
+    if layout["matrix"] != (1.0, 0.0, 0.0, 0.0, 1.0, 0.0):
+        transform = (layout["matrix"], (pixels.shape[1], pixels.shape[0]), size)
+
+    if layout["dpi"] and "--dpi" not in (_split_config(config or "") or ()):
+        config = "{0} --dpi {1}".format(config or "", layout["dpi"]).strip()
+
+    # Color pixels are handed over in the BGR order of OpenCV images
+    if pixels.ndim == 3:
+        pixels = pixels[:, :, ::-1]
+
+    elapsed = time.perf_counter() - start_time
+
+    # Blank pages aren't handed over, binary pixels are packed to 1 bit per pixel
+    if layout["blank"]:
+        output_bytes = 0
+    elif str(pixels.dtype) == "bool":
+        output_bytes = (pixels.shape[1] + 7) // 8 * pixels.shape[0]
+    else:
+        output_bytes = pixels.nbytes
+
+    with _preprocess_lock:
+        _preprocess_stats["images"] += 1
+        _preprocess_stats["blank"] += layout["blank"]
+        _preprocess_stats["elapsed"] += elapsed
+        _preprocess_stats["input_bytes"] += input_bytes
+        _preprocess_stats["output_bytes"] += output_bytes
+
+        for name, value in timings.items():
+            steps_stats = _preprocess_stats["steps"]
+            steps_stats[name] = steps_stats.get(name, 0.0) + value
+
+    if layout["blank"]:
+        return (None, config, None)
+
+    return (pixels, config, transform)
+
+
+def _parse_preprocess(preprocess):
+    """
+    Returns the given preprocessing steps as a list of (name, function, options)
+    tuples, None if any step <or> option is invalid.
+    """
+    funcs = {
+        Preprocess.CROP: _preprocess_crop,
+        Preprocess.ORIENT: _preprocess_orient,
+        Preprocess.GRAY: _preprocess_gray,
+        Preprocess.OTSU: _preprocess_otsu,
+        Preprocess.SAUVOLA: _preprocess_sauvola,
+        Preprocess.DESKEW: _preprocess_deskew,
+        Preprocess.DESPECKLE: _preprocess_despeckle,
+        Preprocess.SCALE: _preprocess_scale,
+    }
+    result = []
+
+    if isinstance(preprocess, str):
+        preprocess = preprocess.split(",")
+    elif (
+        isinstance(preprocess, tuple)
+        and len(preprocess) == 2
+        and isinstance(preprocess[1], dict)
+    ):
+        preprocess = [preprocess]
+
+    for step in preprocess:
+        if isinstance(step, str):
+            name, options = step, {}
+        elif isinstance(step, (list, tuple)) and len(step) == 2:
+            name, options = step
+        else:
+            name, options = None, None
+
+        name = name.strip().lower() if isinstance(name, str) else name
+
+        if name == "":
+            continue
+
+        func = funcs.get(name)
+
+        if not func or not isinstance(options, dict):
+            _warn("_preprocess_image: Invalid preprocessing step: {0}".format(step))
+            return None
+
+        code = func.__code__
+        valid_options = code.co_varnames[3 : code.co_argcount]
+
+        for key, value in options.items():
+            if (
+                key not in valid_options
+                or not isinstance(value, (int, float))
+                or isinstance(value, bool)
+                or value <= 0
+            ):
+                _warn(
+                    "_preprocess_image: Invalid option for the step '{0}': "
+                    "{1}={2}".format(name, key, value)
+                )
+                return None
+
+        result.append((name, func, options))
+
+    return result
+
+
+def _get_image_array(np, image):
+    """
+    Returns a (pixels, dpi) tuple holding the pixels of the given image as an 8-bit
+    grayscale (height, width) <or> RGB (height, width, 3) ndarray, None if they can't
+    be read, and the horizontal resolution of Pillow images, None if it's unknown.
+
+    Image paths and image data are decoded by Pillow. The pixels of image objects
+    are read without copy whenever possible (see '_get_image_buffer').
+    """
+    pixels = dpi = None
+    image = _unwrap_image(image)
+
+    try:
+        if isinstance(image, str) or _is_image_data(image):
+            pil = _import_image_module("pil")
+
+            if not pil:
+                _warn(
+                    "_preprocess_image: Pillow is required to preprocess image paths "
+                    "and image data."
+                )
+                return (None, None)
+
+            data = image if isinstance(image, str) else _prepare_input_data(image)
+
+            if data is None:
+                return (None, None)
+
+            with pil.open(data if isinstance(data, str) else io.BytesIO(data)) as f:
+                pixels = _get_image_buffer(f, "pil", pil)
+                dpi = f.info.get("dpi")
+        else:
+            img_lib = _get_image_lib(image)
+
+            if not img_lib:
+                return (None, None)
+
+            pixels = _get_image_buffer(image, img_lib[0], img_lib[1])
+
+            if img_lib[0] == "pil":
+                dpi = image.info.get("dpi")
+    except Exception as e:
+        _warn("_preprocess_image: Unable to read the image. Error: {0}.".format(e))
+        return (None, None)
+
+    if pixels is None:
+        _warn("_preprocess_image: Unsupported image pixel format.")
+        return (None, None)
+
+    data, width, height, bpp = pixels
+    shape = (height, width) if bpp == 1 else (height, width, 3)
+
+    try:
+        dpi = int(round(dpi[0])) if dpi and dpi[0] >= 1 else None
+    except (TypeError, ValueError):
+        dpi = None
+
+    return (np.frombuffer(data, np.uint8).reshape(shape), dpi)
+
+
+def _get_gray_pixels(np, pixels):
+    """
+    Returns the given pixels as 8-bit grayscale pixels.
+    """
+    if str(pixels.dtype) == "bool":
+        return pixels.view(np.uint8) * np.uint8(255)
+
+    return _preprocess_gray(np, pixels, None)
+
+
+def _preprocess_gray(np, pixels, layout):
+    """
+    Preprocessing step: converts RGB pixels to 8-bit grayscale (ITU-R BT.601 luma).
+    """
+    if pixels.ndim == 3:
+        weights = np.array([0.299, 0.587, 0.114], np.float32)
+        pixels = (pixels @ weights + 0.5).astype(np.uint8)
+
+    return pixels
+
+
+def _preprocess_otsu(np, pixels, layout):
+    """
+    Preprocessing step: binarizes the pixels using Otsu's global threshold.
+    """
+    if str(pixels.dtype) == "bool":
+        return pixels
+
+    gray = _get_gray_pixels(np, pixels)
+
+    return gray > _get_otsu_threshold(np, gray)
+
+
+def _get_otsu_threshold(np, gray):
+    """
+    Returns the threshold which maximizes the between-class variance of the given
+    8-bit grayscale pixels.
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    counts = np.cumsum(hist)
+    sums = np.cumsum(hist * np.arange(256))
+    others = counts[-1] - counts
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (sums[-1] * counts - sums * counts[-1]) ** 2 / (counts * others)
+
+    return int(np.argmax(np.nan_to_num(variance, nan=0.0, posinf=0.0)))
+
+
+def _preprocess_sauvola(np, pixels, layout, window=25, k=0.2):
+    """
+    Preprocessing step: binarizes the pixels using Sauvola's local thresholds,
+    computed over the window centered on each pixel.
+    """
+    if str(pixels.dtype) == "bool":
+        return pixels
+
+    gray = _get_gray_pixels(np, pixels)
+    radius = max(int(window) // 2, 1)
+    size = 2 * radius + 1
+
+    padded = np.pad(gray, radius, mode="edge").astype(np.float64)
+    mean = _get_window_sums(np, padded, size) / size**2
+    square_mean = _get_window_sums(np, np.square(padded, out=padded), size) / size**2
+    deviation = np.sqrt(np.maximum(square_mean - mean * mean, 0.0))
+
+    return gray > mean * (1.0 + k * (deviation / 128.0 - 1.0))
+
+
+def _get_window_sums(np, values, size):
+    """
+    Returns the sums of the given values over each 'size' x 'size' window, using a
+    summed-area table. The returned array is 'size' - 1 smaller than 'values' in
+    both dimensions.
+    """
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+    np.cumsum(values, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+
+    return (
+        table[size:, size:]
+        - table[:-size, size:]
+        - table[size:, :-size]
+        + table[:-size, :-size]
+    )
+
+
+def _preprocess_crop(np, pixels, layout, margin=10, contrast=64, min_pixels=20):
+    """
+    Preprocessing step: crops the pixels to the bounding box of their content, <or>
+    flags the page as blank if it has less than 'min_pixels' content pixels. The
+    cropped pixels are a view of the given ones.
+
+    The content pixels are at least 'contrast' gray levels darker <or> lighter than
+    the background (the median gray level), so light text on a dark background is
+    found as well, and have at least 2 such pixels among their 8 neighbors, so the
+    paper grain and isolated specks don't count.
+    """
+    gray = _get_gray_pixels(np, pixels)
+    counts = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+    background = int(np.searchsorted(counts, counts[-1] / 2.0))
+
+    ink = (gray < background - contrast) | (gray > background + contrast)
+    content = ink & (_get_neighbor_counts(np, ink) >= 2)
+
+    if np.count_nonzero(content) < min_pixels:
+        layout["blank"] = True
+        return pixels
+
+    height, width = content.shape
+    margin = int(margin)
+    rows = np.flatnonzero(content.any(axis=1))
+    cols = np.flatnonzero(content.any(axis=0))
+    top, bottom = max(rows[0] - margin, 0), min(rows[-1] + 1 + margin, height)
+    left, right = max(cols[0] - margin, 0), min(cols[-1] + 1 + margin, width)
+
+    if (top, bottom, left, right) == (0, height, 0, width):
+        return pixels
+
+    matrix = (1.0, 0.0, float(left), 0.0, 1.0, float(top))
+    layout["matrix"] = _compose_matrices(layout["matrix"], matrix)
+
+    return pixels[top:bottom, left:right]
+
+
+def _preprocess_orient(np, pixels, layout, min_confidence=2.0):
+    """
+    Preprocessing step: rotates the pixels by the multiple of 90 degrees found by
+    the OSD pass (see '_get_orientation'). The rotated pixels are a view of the
+    given ones.
+    """
+    rotate = _get_orientation(np, pixels, layout["config"], min_confidence)
+
+    if not rotate:
+        return pixels
+
+    height, width = pixels.shape[:2]
+
+    # Clockwise rotations, the matrices map the rotated coordinates back
+    if rotate == 90:
+        matrix = (0.0, 1.0, 0.0, -1.0, 0.0, float(height))
+    elif rotate == 180:
+        matrix = (-1.0, 0.0, float(width), 0.0, -1.0, float(height))
+    else:
+        matrix = (0.0, -1.0, float(width), 1.0, 0.0, 0.0)
+
+    layout["matrix"] = _compose_matrices(layout["matrix"], matrix)
+
+    return np.rot90(pixels, -rotate // 90)
+
+
+def _get_orientation(np, pixels, config, min_confidence):
+    """
+    Returns the clockwise rotation (0, 90, 180 <or> 270 degrees) which turns the
+    text of the given pixels upright, 0 if the orientation confidence is lower than
+    'min_confidence'.
+
+    The OSD pass is run on grayscale pixels downsampled to about 2000 pixels on
+    their longest side, and only if they hold dark pixels. Its result is cached by
+    digest of these pixels. The '--tessdata-dir' option of 'config' is kept.
+    """
+    step = max(max(pixels.shape[:2]) // 2000, 1)
+    sample = np.ascontiguousarray(_get_gray_pixels(np, pixels[::step, ::step]))
+
+    # Blank pages have no orientation
+    if sample.min() >= 128:
+        return 0
+
+    key = (sample.shape, hashlib.blake2b(sample, digest_size=20).digest())
+
+    with _preprocess_lock:
+        osd = _orient_cache.get(key)
+
+        if osd is not None:
+            _orient_cache.move_to_end(key)
+
+    if osd is None:
+        args = _split_config(config or "") or []
+        osd_config = None
+
+        if "--tessdata-dir" in args[:-1]:
+            datadir = args[args.index("--tessdata-dir") + 1]
+            osd_config = "--tessdata-dir {0}".format(shlex.quote(datadir))
+
+        tempfiles = []
+
+        try:
+            result = _image_to_data_exec(
+                sample,
+                ("osd",),
+                DataOutput.DICT,
+                None,
+                osd_config,
+                tempfiles,
+                _get_deadline(None, None),
+            )
+        finally:
+            _defer_remove_temp_files(tempfiles)
+
+        # Failed passes aren't cached
+        if not result:
+            return 0
+
+        rotate = result[0].get("rotate")
+        confidence = result[0].get("orientation_confidence")
+        osd = (
+            rotate if rotate in (90, 180, 270) else 0,
+            confidence if isinstance(confidence, (int, float)) else 0.0,
+        )
+
+        with _preprocess_lock:
+            _orient_cache[key] = osd
+
+            while len(_orient_cache) > 1024:
+                _orient_cache.popitem(last=False)
+
+    return osd[0] if osd[1] >= min_confidence else 0
+
+
+def _preprocess_deskew(np, pixels, layout, max_angle=5.0):
+    """
+    Preprocessing step: rotates the pixels so the text lines become horizontal.
+    """
+    angle = _get_skew_angle(np, pixels, max_angle)
+
+    if abs(angle) < 0.05:
+        return pixels
+
+    height, width = pixels.shape[:2]
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    center_x, center_y = width / 2.0, height / 2.0
+
+    # Rotation around the center of the pixels
+    matrix = (
+        cos,
+        -sin,
+        center_x - cos * center_x + sin * center_y,
+        sin,
+        cos,
+        center_y - sin * center_x - cos * center_y,
+    )
+    layout["matrix"] = _compose_matrices(layout["matrix"], matrix)
+
+    return _warp_pixels(np, pixels, matrix)
+
+
+def _get_skew_angle(np, pixels, max_angle):
+    """
+    Returns the skew angle (in degrees) of the text lines of the given pixels.
+
+    The angle is the one which maximizes the sum of squares of the horizontal
+    projection profile of the dark pixels, searched by steps of 0.5 then 0.05 degree
+    on pixels downsampled to about 1000 pixels on their longest side.
+    """
+    ink = ~_preprocess_otsu(np, pixels, None)
+    step = max(max(ink.shape) // 1000, 1)
+    ys, xs = np.nonzero(ink[::step, ::step])
+
+    if len(ys) < 2:
+        return 0.0
+
+    ys, xs = ys.astype(np.float64), xs.astype(np.float64)
+    angles = np.arange(-max_angle, max_angle + 0.25, 0.5)
+    best = max(angles, key=lambda a: _get_profile_score(np, ys, xs, a))
+    angles = np.arange(best - 0.5, best + 0.525, 0.05)
+    best = max(angles, key=lambda a: _get_profile_score(np, ys, xs, a))
+
+    return float(best)
+
+
+def _get_profile_score(np, ys, xs, angle):
+    """
+    Returns the sum of squares of the projection profile of the given dark pixels
+    coordinates, along lines skewed by the given angle (in degrees).
+    """
+    rows = np.rint(ys - xs * np.tan(np.radians(angle))).astype(np.intp)
+    profile = np.bincount(rows - rows.min())
+
+    return int(np.dot(profile, profile))
+
+
+def _warp_pixels(np, pixels, matrix):
+    """
+    Returns the given pixels transformed by the given matrix, which maps the
+    coordinates of the returned pixels to the source ones (see '_compose_matrices').
+    Each pixel takes the value of the nearest source pixel, the size is kept and the
+    uncovered areas are filled with white.
+    """
+    height, width = pixels.shape[:2]
+    a, b, c, d, e, f = matrix
+
+    # Coordinates of the center of each pixel
+    ys = np.arange(height, dtype=np.float32)[:, None] + 0.5
+    xs = np.arange(width, dtype=np.float32)[None, :] + 0.5
+    src_x = np.floor(a * xs + b * ys + c).astype(np.int32)
+    src_y = np.floor(d * xs + e * ys + f).astype(np.int32)
+    inside = (src_x >= 0) & (src_x < width) & (src_y >= 0) & (src_y < height)
+
+    result = np.full_like(pixels, 255)
+    result[inside] = pixels[src_y[inside], src_x[inside]]
+
+    return result
+
+
+def _preprocess_despeckle(np, pixels, layout, min_neighbors=2):
+    """
+    Preprocessing step: turns white the dark pixels which have less than
+    'min_neighbors' dark pixels among their 8 neighbors (isolated dots and specks of
+    2 pixels by default).
+    """
+    ink = ~_preprocess_otsu(np, pixels, None)
+    speckles = ink & (_get_neighbor_counts(np, ink) < min_neighbors)
+
+    if not speckles.any():
+        return pixels
+
+    pixels = pixels.copy()
+    pixels[speckles] = 255
+
+    return pixels
+
+
+def _get_neighbor_counts(np, mask):
+    """
+    Returns the number of True values among the 8 neighbors of each value of the
+    given boolean array.
+    """
+    height, width = mask.shape
+    padded = np.pad(mask, 1).view(np.uint8)
+    neighbors = np.zeros(mask.shape, np.uint8)
+
+    for dy in range(3):
+        for dx in range(3):
+            if dy != 1 or dx != 1:
+                neighbors += padded[dy : dy + height, dx : dx + width]
+
+    return neighbors
+
+
+def _preprocess_scale(np, pixels, layout, x_height=20, dpi=300):
+    """
+    Preprocessing step: resamples the pixels so the x-height of the text gets close
+    to 'x_height' pixels, <or> so the image resolution gets close to 'dpi' if the
+    x-height can't be estimated. The scale is bounded to [0.25, 4] and the pixels
+    are kept as is when it's close to 1.
+    """
+    text_height = _get_x_height(np, pixels)
+
+    if text_height:
+        scale = x_height / text_height
+    elif layout["dpi"]:
+        scale = dpi / layout["dpi"]
+    else:
+        return pixels
+
+    # The resolution of the resampled pixels is the one matching the target size
+    applied_scale = min(max(scale, 0.25), 4.0)
+
+    if abs(applied_scale - 1.0) < 0.15:
+        applied_scale = 1.0
+
+    layout["dpi"] = int(round(dpi * applied_scale / scale))
+
+    if applied_scale == 1.0:
+        return pixels
+
+    height, width = pixels.shape[:2]
+    new_width = max(int(round(width * applied_scale)), 1)
+    new_height = max(int(round(height * applied_scale)), 1)
+    matrix = (width / new_width, 0.0, 0.0, 0.0, height / new_height, 0.0)
+    layout["matrix"] = _compose_matrices(layout["matrix"], matrix)
+
+    return _resize_pixels(np, pixels, new_width, new_height)
+
+
+def _get_x_height(np, pixels):
+    """
+    Returns the median x-height (in pixels) of the text lines of the given pixels,
+    None if no text line is found.
+
+    The text lines are the bands of rows of the horizontal projection profile of the
+    dark pixels, the x-height of a line is the number of its rows holding at least
+    half the dark pixels of its densest row (the ascenders and descenders are less
+    dense than the body of the letters).
+    """
+    profile = (~_preprocess_otsu(np, pixels, None)).sum(axis=1)
+
+    if not profile.any():
+        return None
+
+    # Rows of a text line hold more than a few dark pixels
+    rows = np.concatenate(([False], profile > max(profile.max() // 20, 1), [False]))
+    edges = np.flatnonzero(rows[1:] != rows[:-1]).reshape(-1, 2)
+    heights = []
+
+    for start, end in edges:
+        band = profile[start:end]
+
+        if len(band) >= 3:
+            heights.append(int(np.count_nonzero(band >= band.max() / 2.0)))
+
+    return float(np.median(heights)) if heights else None
+
+
+def _resize_pixels(np, pixels, width, height):
+    """
+    Returns the given pixels resized to 'width' x 'height', averaging the covered
+    pixels to shrink them and interpolating them linearly to enlarge them. Binary
+    pixels are binarized again after the resampling.
+    """
+    binary = str(pixels.dtype) == "bool"
+    values = pixels.view(np.uint8) * np.float32(255) if binary else pixels
+
+    values = _resize_axis(np, values.astype(np.float32), height, 0)
+    values = _resize_axis(np, values, width, 1)
+
+    if binary:
+        return values > 127.5
+
+    return np.rint(values, out=values).astype(np.uint8)
+
+
+def _resize_axis(np, values, size, axis):
+    """
+    Returns the given float32 values resampled to 'size' values along 'axis'.
+    """
+    count = values.shape[axis]
+    values = np.moveaxis(values, axis, 0)
+    shape = (size,) + (1,) * (values.ndim - 1)
+
+    if size < count:
+        # Area average: differences of the cumulative sums at the edges of the pixels
+        sums = np.zeros((count + 1,) + values.shape[1:], np.float32)
+        np.cumsum(values, axis=0, out=sums[1:])
+        edges = np.arange(size + 1, dtype=np.float64) * count / size
+        index = np.minimum(edges.astype(np.intp), count - 1)
+        fraction = (edges - index).astype(np.float32).reshape((size + 1,) + shape[1:])
+        sums = sums[index] + fraction * (sums[index + 1] - sums[index])
+        result = (sums[1:] - sums[:-1]) * np.float32(size / count)
+    else:
+        centers = (np.arange(size, dtype=np.float64) + 0.5) * count / size - 0.5
+        centers = np.clip(centers, 0, count - 1)
+        index = centers.astype(np.intp)
+        weight = (centers - index).astype(np.float32).reshape(shape)
+        next_index = np.minimum(index + 1, count - 1)
+        result = values[index] * (1 - weight) + values[next_index] * weight
+
+    return np.moveaxis(result, 0, axis)
+
+
+def _compose_matrices(first, second):
+    """
+    Returns the (a, b, c, d, e, f) matrix applying 'second' then 'first'. A matrix
+    maps the (x, y) coordinates to (a * x + b * y + c, d * x + e * y + f).
+    """
+    a1, b1, c1, d1, e1, f1 = first
+    a2, b2, c2, d2, e2, f2 = second
+
+    return (
+        a1 * a2 + b1 * d2,
+        a1 * b2 + b1 * e2,
+        a1 * c2 + b1 * f2 + c1,
+        d1 * a2 + e1 * d2,
+        d1 * b2 + e1 * e2,
+        d1 * c2 + e1 * f2 + f1,
+    )
+
+
+def _map_output(data, fmt, transform):
+    """
+    Maps the coordinates of the given 'box', 'tsv' <or> 'hocr' output data of a
+    preprocessed image back to the original image.
+
+    'transform' is a (matrix, size, original size) tuple (see '_preprocess_image'),
+    the data is returned as is if None <or> if the format holds no coordinates.
+    """
+    if not transform or not data or fmt not in ("box", "tsv", "hocr"):
+        return data
+
+    if isinstance(data, bytes):
+        return _map_output(data.decode("utf-8"), fmt, transform).encode("utf-8")
+
+    if fmt == "hocr":
+        return re.sub(
+            r"bbox (\d+) (\d+) (\d+) (\d+)",
+            lambda m: "bbox {0} {1} {2} {3}".format(
+                *_map_rect(transform, *map(int, m.groups()))
+            ),
+            data,
+        )
+
+    lines = data.split("\n")
+    height = transform[1][1]
+    original_height = transform[2][1]
+
+    for idx, line in enumerate(lines):
+        if fmt == "tsv":
+            values = line.split("\t")
+
+            if len(values) < 10 or not all(v.isdigit() for v in values[6:10]):
+                continue
+
+            left, top, width, box_height = map(int, values[6:10])
+            left, top, right, bottom = _map_rect(
+                transform, left, top, left + width, top + box_height
+            )
+            values[6:10] = map(str, (left, top, right - left, bottom - top))
+            lines[idx] = "\t".join(values)
+        else:
+            # The box coordinates have their origin at the bottom-left corner
+            values = line.rsplit(" ", 5)
+
+            if len(values) < 6 or not all(v.isdigit() for v in values[1:5]):
+                continue
+
+            left, bottom, right, top = map(int, values[1:5])
+            left, top, right, bottom = _map_rect(
+                transform, left, height - top, right, height - bottom
+            )
+            values[1:5] = map(
+                str, (left, original_height - bottom, right, original_height - top)
+            )
+            lines[idx] = " ".join(values)
+
+    return "\n".join(lines)
+
+
+def _map_rect(transform, left, top, right, bottom):
+    """
+    Returns the bounding (left, top, right, bottom) rectangle of the given
+    rectangle mapped to the original image, clipped to its size.
+    """
+    a, b, c, d, e, f = transform[0]
+    width, height = transform[2]
+    xs, ys = [], []
+
+    for x, y in ((left, top), (right, top), (left, bottom), (right, bottom)):
+        xs.append(a * x + b * y + c)
+        ys.append(d * x + e * y + f)
+
+    return (
+        min(max(int(math.floor(min(xs))), 0), width),
+        min(max(int(math.floor(min(ys))), 0), height),
+        min(max(int(math.ceil(max(xs))), 0), width),
+        min(max(int(math.ceil(max(ys))), 0), height),
+    )
+
+
+def _map_output_files(out_files, transform):
+    """
+    Maps the coordinates of the given output files back to the original image,
+    rewriting them in place (see '_map_output').
+
+    Returns 'out_files'.
+    """
+    if not transform:
+        return out_files
+
+    for fp in out_files or ():
+        file_ext = os.path.splitext(fp)[1][1:]
+
+        if file_ext not in ("box", "tsv", "hocr"):
+            continue
+
+        file_data = _read_file(fp, True)
+
+        if not file_data:
+            continue
+
+        try:
+            with open(fp, "wb") as f:
+                f.write(_map_output(file_data, file_ext, transform))
+        except IOError as e:
+            _warn(
+                "_map_output_files: Could not write the file '{0}'\n"
+                "I/O Error ({1}): {2}.".format(fp, e.errno, e.strerror)
+            )
+
+    return out_files
+
+
+def _proc_exec_wait(command, silent=False, input_data=None, deadline=None):
+    """
+    Starts a new process using the given arguments list and wait until it ends.
+
+    If 'silent' is set to True, all warning messages will be ignored.
+
+    If 'input_data' is set, it's written to the process standard input. It can also
+    be a tuple of buffers, written in order.
+
+    If 'deadline' is set, the process group is killed once it expires.
+    """
+    result = (Status.ERROR, None, None)
+    proc = None
+    timeout = _get_remaining_time(deadline)
+
+    if timeout is not None and timeout <= 0:
+        if not silent:
+            _warn_timeout("_proc_exec_wait", command[0])
+
+        return (Status.TIMEOUT, None, None)
+
+    try:
+        # Processes fed through stdin may already be warm (see 'standby')
+        if input_data is not None:
+            proc = _standby_acquire(tuple(command))
+
+        if proc is None:
+            proc = subprocess.Popen(
+                command,
+                **_get_popen_kwargs(input_data is not None, deadline is not None),
+            )
+
+        # Leading buffers are written ahead, 'communicate' flushes them first
+        if isinstance(input_data, tuple):
+            for buffer in input_data[:-1]:
+                proc.stdin.write(buffer)
+
+            input_data = input_data[-1]
+
+        try:
+            stdoutdata, stderrdata = proc.communicate(input_data, timeout)
+        except subprocess.TimeoutExpired:
+            _kill_proc_group(proc)
+            proc.communicate()
+
+            if not silent:
+                _warn_timeout("_proc_exec_wait", command[0])
+
+            return (Status.TIMEOUT, None, None)
+        except KeyboardInterrupt:
+            # A process started in its own session doesn't get the terminal signals
+            _kill_proc_group(proc)
+            raise
+
+        status = proc.returncode
+
+        # Invalid UTF-8 output (e.g.: a damaged language data) isn't a process error
+        result = (
+            status,
+            stdoutdata.decode("utf8", "replace"),
+            stderrdata.decode("utf8", "replace"),
+        )
+    except Exception as e:
+        if not silent:
+            _warn(
+                "_proc_exec_wait: Could not open the process: '{0}'\n"
+                "Error: {1}.".format(command[0], e)
+            )
+    finally:
+        if proc:
+            if proc.stdout:
+                proc.stdout.close()
+
+            if proc.stderr:
+                proc.stderr.close()
+
+            if proc.stdin:
+                proc.stdin.close()
+
+    return result
+
+
+async def _proc_exec_wait_async(command, silent=False, input_data=None, deadline=None):
+    """
+    Starts a new asyncio subprocess using the given arguments list and wait until 
+    it ends.
+
+    The process is killed if the awaiting task gets cancelled.
+
+    If 'silent' is set to True, all warning messages will be ignored.
+
+    If 'input_data' is set, it's written to the process standard input. It can also
+    be a tuple of buffers, written in order.
+
+    If 'deadline' is set, the process group is killed once it expires.
+    """
+    result = (Status.ERROR, None, None)
+    proc = None
+    timeout = _get_remaining_time(deadline)
+
+    if timeout is not None and timeout <= 0:
+        if not silent:
+            _warn_timeout("_proc_exec_wait_async", command[0])
+
+        return (Status.TIMEOUT, None, None)
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *command, **_get_popen_kwargs(input_data is not None, deadline is not None)
+        )
+
+        # Leading buffers are written ahead, 'communicate' drains them first
+        if isinstance(input_data, tuple):
+            for buffer in input_data[:-1]:
+                proc.stdin.write(buffer)
+
+            input_data = input_data[-1]
+
+        stdoutdata, stderrdata = await asyncio.wait_for(
+            proc.communicate(input_data), timeout
+        )
+        status = proc.returncode
+
+        # Invalid UTF-8 output (e.g.: a damaged language data) isn't a process error
+        result = (
+            status,
+            stdoutdata.decode("utf8", "replace"),
+            stderrdata.decode("utf8", "replace"),
+        )
+    except asyncio.TimeoutError:
+        _kill_proc_group(proc)
+        await proc.wait()
+
+        if not silent:
+            _warn_timeout("_proc_exec_wait_async", command[0])
+
+        result = (Status.TIMEOUT, None, None)
+    except asyncio.CancelledError:
+        if proc and proc.returncode is None:
+            _kill_proc_group(proc)
+
+            # Reap the killed process to avoid leaving a zombie behind
+            await proc.wait()
+        raise
+    except Exception as e:
+        if not silent:
+            _warn(
+                "_proc_exec_wait_async: Could not open the process: '{0}'\n"
+                "Error: {1}.".format(command[0], e)
+            )
+
+    return result
+
+
+def _standby_acquire(command):
+    """
+    Returns a warm standby process started with the given arguments tuple, or None
+    if there's none available.
+
+    A replacement process is started in the background.
+    """
+    result = None
+
+    if command not in _standby_counts:
+        return result
+
+    with _standby_lock:
+        procs = _standby_procs.get(command, [])
+
+        while procs and result is None:
+            proc = procs.pop(0)
+
+            # The process may have exited (e.g.: invalid language)
+            if proc.poll() is None:
+                result = proc
+            else:
+                _kill_procs([proc])
+
+    threading.Thread(target=_standby_fill, args=(command,), daemon=True).start()
+
+    return result
+
+
+def _standby_fill(command):
+    """
+    Starts as many standby processes as required by the given arguments tuple.
+    """
+    with _standby_lock:
+        missing = _standby_counts.get(command, 0) - len(_standby_procs.get(command, []))
+
+    new_procs = []
+
+    for idx in range(0, missing):
+        try:
+            new_procs.append(subprocess.Popen(command, **_get_popen_kwargs(True)))
+        except Exception as e:
+            _warn(
+                "_standby_fill: Could not open the process: '{0}'\n"
+                "Error: {1}.".format(command[0], e)
+            )
+            break
+
+    extra_procs = []
+
+    with _standby_lock:
+        count = _standby_counts.get(command, 0)
+        procs = _standby_procs.setdefault(command, [])
+        procs.extend(new_procs)
+
+        # Concurrent fills or count updates may have started too many processes
+        if len(procs) > count:
+            extra_procs = procs[count:]
+            del procs[count:]
+
+    _kill_procs(extra_procs)
+
+
+def _reset_after_fork():
+    """
+    Forgets the standby processes, the in-flight calls, the batch worker state and
+    the temporary directories inherited from the parent process and recreates the
+    module locks, which may have been held by another thread of the parent when it
+    forked.
+    """
+    global _standby_lock, _lib_lock, _result_cache_lock, _disk_cache_lock
+    global _disk_cache_prune_lock, _inflight_lock, _probe_lock, _preprocess_lock
+    global _temp_cond, _temp_thread
+    global _temp_prefix, _temp_counter, _batch_initialized
+
+    _standby_lock = threading.Lock()
+    _lib_lock = threading.Lock()
+    _result_cache_lock = threading.Lock()
+    _disk_cache_lock = threading.Lock()
+    _disk_cache_prune_lock = threading.Lock()
+    _inflight_lock = threading.Lock()
+    _probe_lock = threading.Lock()
+    _preprocess_lock = threading.Lock()
+    _temp_cond = threading.Condition()
+    _temp_thread = None
+    _batch_initialized = False
+
+    # The temporary names and directories of the parent aren't reused
+    _temp_prefix = "TESS_{0}_".format(os.urandom(6).hex())
+    _temp_counter = itertools.count()
+    _temp_dirs.clear()
+    _temp_trash.clear()
+    _temp_checks.clear()
+
+    _standby_procs.clear()
+    _standby_counts.clear()
+    _inflight.clear()
+
+
+def _kill_procs(procs):
+    """
+    Kills and reaps each given process.
+    """
+    for proc in procs:
+        try:
+            if proc.poll() is None:
+                proc.kill()
+
+            proc.communicate()
+        except Exception:
+            pass
+
+
+def _kill_proc_group(proc):
+    """
+    Kills the given process, along with its process group if it leads one.
+    """
+    try:
+        if not _platform_windows and os.getpgid(proc.pid) == proc.pid:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def _get_deadline(timeout, deadline):
+    """
+    Returns the earliest of the given timeout (in seconds) and deadline (monotonic
+    time) as a deadline, the default timeout applies if none is given.
+
+    Returns None if the call has no deadline.
+    """
+    if timeout is None and deadline is None:
+        timeout = _config.timeout
+
+    if timeout is not None:
+        timeout_deadline = time.monotonic() + timeout
+        deadline = (
+            timeout_deadline if deadline is None else min(deadline, timeout_deadline)
+        )
+
+    return deadline
+
+
+def _get_remaining_time(deadline):
+    """
+    Returns the number of seconds left before the given deadline, None if there's
+    no deadline.
+    """
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _warn_timeout(caller_name, process_name):
+    """
+    Warns that a Tesseract process has been killed because its deadline expired.
+    """
+    _warn(
+        "{0}: '{1}' timed out and has been killed.".format(caller_name, process_name),
+        TessyTimeoutWarning,
+    )
+
+
+def _split_command_line(command_line, silent=False):
+    """
+    Splits the given command line into a list of arguments.
+
+    Returns None if the command line can't be parsed.
+    """
+    result = None
+
+    if _platform_windows:
+        command_line = command_line.replace("\\", "/")
+
+    try:
+        result = shlex.split(command_line)
+    except Exception as e:
+        if not silent:
+            _warn(
+                "_split_command_line: Unable to parse the given command line: {0}\n"
+                "Error: {1}.".format(command_line, e)
+            )
+
+    return result
+
+
+def _get_popen_kwargs(use_stdin=False, new_group=False):
+    """
+    Returns the keyword arguments used to start any Tesseract process.
+
+    If 'use_stdin' is set to True, the process standard input is piped.
+
+    If 'new_group' is set to True, the process leads its own process group so it can
+    be killed along with its children (POSIX only).
+
+    On Windows, the process console window is hidden.
+    """
+    sp_kwargs = {
+        "stdin": subprocess.PIPE if use_stdin else None,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "startupinfo": None,
+        "env": os.environ,
+    }
+
+    if _platform_windows:
+        sp_kwargs["startupinfo"] = subprocess.STARTUPINFO()
+        sp_kwargs["startupinfo"].dwFlags = (
+            subprocess.CREATE_NEW_CONSOLE | subprocess.STARTF_USESHOWWINDOW
+        )
+        sp_kwargs["startupinfo"].wShowWindow = subprocess.SW_HIDE
+    elif new_group:
+        sp_kwargs["start_new_session"] = True
+
+    return sp_kwargs
+
+
+def _get_temp_dir(use_preserved=True):
+    """
+    Returns the location of the system temporary directory.
+
+    If 'use_preserved' is set to True, the preserved temporary directory will be 
+    used on Linux and macOS.
+    """
+    result = tempfile.gettempdir()
+
+    if use_preserved and not _platform_windows:
+        preserved_tempdir = "/var/tmp"
+
+        if os.path.isdir(preserved_tempdir):
+            result = preserved_tempdir
+
+    return result
+
+
+def _get_temp_file_name():
+    """
+    Returns a unique temporary file name with 'TESS_' prefix, without any system 
+    call: a random prefix drawn per process followed by a counter.
+    """
+    return "{0}{1:x}".format(_temp_prefix, next(_temp_counter))
+
+
+def _read_file(filepath, return_bytes=False):
+    """
+    Reads and return the given file name content.
 
     If 'return_bytes' is set to True, the returned value will be bytes instead 
     of a UTF-8 string.
@@ -1431,6 +6535,220 @@ def _remove_file(filepath):
         )
 
 
+def _keep_temp_files(status, call_tempfiles, tempfiles):
+    """
+    Appends the temporary files of a call to 'tempfiles', or hands them to the 
+    cleanup thread if the call timed out.
+    """
+    if status == Status.TIMEOUT:
+        _defer_remove_temp_files(call_tempfiles)
+    else:
+        tempfiles.extend(call_tempfiles)
+
+
+def _remove_temp_files(tf_list):
+    """
+    Removes each existing file of the given temporary files list.
+    """
+    for tf in tf_list:
+        if os.path.isfile(tf):
+            _remove_file(tf)
+
+
+def _defer_remove_temp_files(tf_list):
+    """
+    Hands the given temporary files list to the cleanup thread, which removes the 
+    files in the background.
+    """
+    if tf_list:
+        with _temp_cond:
+            _temp_trash.extend(tf_list)
+            _notify_temp_thread()
+
+
+def _check_temp_size():
+    """
+    Asks the cleanup thread to enforce the size limit of the temporary files 
+    returned by the 'image_to_file' functions of the active session.
+    """
+    config = _config_var.get()
+
+    if config.tempbytes and config.tempfiles:
+        with _temp_cond:
+            if not any(c is config for c in _temp_checks):
+                _temp_checks.append(config)
+
+            _notify_temp_thread()
+
+
+def _notify_temp_thread():
+    """
+    Wakes the cleanup thread up, which is started on first use.
+
+    '_temp_cond' must be held by the caller.
+    """
+    global _temp_thread
+
+    if _temp_thread is None:
+        _temp_thread = threading.Thread(target=_temp_cleanup_loop, daemon=True)
+        _temp_thread.start()
+
+    _temp_cond.notify()
+
+
+def _temp_cleanup_loop():
+    """
+    Cleanup thread: removes the deferred temporary files and enforces the size limit 
+    of the temporary files of each notified session.
+    """
+    while True:
+        with _temp_cond:
+            while not _temp_trash and not _temp_checks:
+                _temp_cond.wait()
+
+            tf_list = _temp_trash[:]
+            configs = _temp_checks[:]
+            _temp_trash.clear()
+            _temp_checks.clear()
+
+        _remove_temp_files(tf_list)
+
+        for config in configs:
+            _enforce_temp_size(config)
+
+
+def _enforce_temp_size(config):
+    """
+    Removes the oldest files of the given configuration 'tempfiles' list until their
+    total size fits in its 'tempbytes' limit.
+    """
+    tempfiles = config.tempfiles
+    tf_list = tempfiles[:]
+    sizes = []
+
+    for tf in tf_list:
+        try:
+            sizes.append(os.path.getsize(tf))
+        except OSError:
+            sizes.append(0)
+
+    excess = sum(sizes) - config.tempbytes
+    count = 0
+
+    while excess > 0 and count < len(sizes):
+        excess -= sizes[count]
+        count += 1
+
+    if not count:
+        return
+
+    with _temp_cond:
+        # The list may have been cleared in the meantime
+        if tempfiles[:count] != tf_list[:count]:
+            return
+
+        del tempfiles[:count]
+
+    _remove_temp_files(tf_list[:count])
+
+
+def _get_temp_path():
+    """
+    Returns a new unique path within the temporary directory of the active session.
+    """
+    return os.path.join(_get_session_temp_dir(), _get_temp_file_name())
+
+
+def _get_session_temp_dir():
+    """
+    Returns the temporary directory of the active session, created on first use by 
+    the current process.
+
+    Falls back to the system temporary directory if it can't be created.
+    """
+    temp_dir = _config.tempdir
+
+    if temp_dir in _temp_dirs:
+        return temp_dir
+
+    with _temp_cond:
+        temp_dir = _config.tempdir
+
+        if temp_dir not in _temp_dirs:
+            try:
+                temp_dir = tempfile.mkdtemp(prefix=_temp_prefix, dir=_get_temp_base())
+            except OSError as e:
+                _warn(
+                    "Could not create the temporary directory.\n"
+                    "OS Error ({0}): {1}.".format(e.errno, e.strerror)
+                )
+                return _get_temp_dir(False)
+
+            _temp_dirs.add(temp_dir)
+            _config.tempdir = temp_dir
+
+    return temp_dir
+
+
+def _get_temp_base():
+    """
+    Returns the directory in which the temporary directory of the active session 
+    gets created.
+
+    /dev/shm is preferred when it has room for the temporary files size limit plus 
+    a 64 MiB margin, the system temporary directory is used otherwise.
+    """
+    if _config.tempbase:
+        return _config.tempbase
+
+    shm_dir = "/dev/shm"
+
+    if not _platform_windows and os.access(shm_dir, os.W_OK):
+        try:
+            stats = os.statvfs(shm_dir)
+
+            if stats.f_bavail * stats.f_frsize >= _config.tempbytes + 64 * 1024 * 1024:
+                return shm_dir
+        except OSError:
+            pass
+
+    return _get_temp_dir(False)
+
+
+def _remove_temp_dir():
+    """
+    Removes the temporary directory of the active session and every file it holds.
+    """
+    with _temp_cond:
+        temp_dir = _config.tempdir
+
+        if temp_dir not in _temp_dirs:
+            return
+
+        _temp_dirs.discard(temp_dir)
+        _config.tempdir = None
+        _config.tempfiles.clear()
+
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _remove_temp_dirs():
+    """
+    Removes the deferred temporary files and the temporary directories created by 
+    the current process.
+    """
+    with _temp_cond:
+        tf_list = _temp_trash[:]
+        temp_dirs = list(_temp_dirs)
+        _temp_trash.clear()
+        _temp_dirs.clear()
+
+    _remove_temp_files(tf_list)
+
+    for temp_dir in temp_dirs:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 def _write_file(filepath, content):
     """
     Writes the specified content to the given file name.
@@ -1450,17 +6768,6 @@ def _write_file(filepath, content):
     return result
 
 
-def _escape_path(path):
-    """
-    Escapes the given path.
-
-    - On Windows encloses the path if it contains space(s).
-    - On Linux/macOS prefix any space with a backslash.
-    """
-    path = path.strip()
-    return '"{0}"'.format(path) if _platform_windows else path.replace(" ", "\\ ")
-
-
 def _parse_errors(error_string):
     """
     Parse the returned error data string from the Tesseract process.
@@ -1481,8 +6788,87 @@ def _parse_errors(error_string):
     return result
 
 
-def _warn(msg):
+def _warn(msg, category=TessyWarning):
     """
-    Displays the given warning message using TessyWarning class.
+    Displays the given warning message using the given TessyWarning class.
+
+    The message is recorded instead if a recorder is active in the current thread.
+    """
+    records = getattr(_warn_records, "messages", None)
+
+    if records is not None:
+        records.append(msg)
+    else:
+        warnings.warn(msg, category, stacklevel=3)
+
+
+def _session_method(func, coroutine=False):
     """
-    warnings.warn(msg, TessyWarning, stacklevel=3)
+    Returns a 'TessySession' method calling the given module function (or coroutine 
+    function) using the session configuration.
+    """
+    if coroutine:
+
+        async def method(self, *args, **kwargs):
+            return await self._call_async(func, *args, **kwargs)
+
+    else:
+
+        def method(self, *args, **kwargs):
+            return self._call(func, *args, **kwargs)
+
+    functools.update_wrapper(method, func)
+    method.__qualname__ = "{0}.{1}".format(TessySession.__name__, func.__name__)
+    method.__doc__ = "Session version of __[{0}](@@${0})__.".format(func.__name__)
+
+    return method
+
+
+for _func in (
+    command,
+    set_command,
+    data_dir,
+    set_data_dir,
+    content_sep,
+    set_content_sep,
+    backend,
+    set_backend,
+    default_timeout,
+    set_default_timeout,
+    set_result_cache,
+    set_disk_cache,
+    coalescing,
+    set_coalescing,
+    temp_dir,
+    set_temp_dir,
+    configure,
+    init,
+    warm_up,
+    image_to_file,
+    image_to_data,
+    image_to_string,
+    image_to_data_many,
+    image_to_string_many,
+    locate,
+    run,
+    runnable,
+    start,
+    tesseract_version,
+    tesseract_info,
+    installed_langs,
+    lang_installed,
+    standby,
+    clear_temp,
+):
+    setattr(TessySession, _func.__name__, _session_method(_func))
+
+for _func in (image_to_file_async, image_to_data_async, image_to_string_async):
+    setattr(TessySession, _func.__name__, _session_method(_func, True))
+
+del _func
+
+atexit.register(clear_standby)
+atexit.register(_remove_temp_dirs)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,176 @@
+"""
+Checks of the tessy internals which don't need Tesseract to be installed.
+
+Usage: python -m unittest discover tests
+"""
+import ctypes
+import unittest
+import unittest.mock
+import warnings
+
+import tessy
+import tessy._tessy as _tessy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FakeTess(object):
+    """
+    Stands for libtesseract: records the engine languages and resolutions and
+    returns them as the recognized text.
+    """
+
+    def __init__(self):
+        self.langs = []
+        self.resolutions = []
+        self.texts = []
+
+    def __getattr__(self, name):
+        # Calls which don't matter to the checks do nothing
+        return lambda *args: 0
+
+    def TessBaseAPICreate(self):
+        return 1
+
+    def TessBaseAPIInit2(self, handle, datadir, lang, oem):
+        self.langs.append(lang.decode("utf-8"))
+        return 0
+
+    def TessBaseAPISetSourceResolution(self, handle, dpi):
+        self.resolutions.append(dpi)
+
+    def TessBaseAPIGetUTF8Text(self, handle):
+        text = ctypes.create_string_buffer(
+            "{0} {1}".format(self.langs[-1], self.resolutions[-1]).encode("utf-8")
+        )
+        self.texts.append(text)
+
+        return ctypes.addressof(text)
+
+
+class FakeLept(object):
+    """
+    Stands for Leptonica: decodes any image data as a 300 DPI image.
+    """
+
+    def pixReadMem(self, data, size):
+        return 1
+
+    def pixGetYRes(self, pix):
+        return 300
+
+    def pixDestroy(self, pix):
+        pass
+
+
+class LibBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.tess = FakeTess()
+        _tessy._lib.clear()
+        _tessy._lib.update(tess=self.tess, lept=FakeLept())
+        _tessy._lib_local.__dict__.clear()
+        tessy.set_backend(tessy.Backend.LIB)
+
+        # The data directory isn't set without Tesseract
+        catcher = warnings.catch_warnings()
+        catcher.__enter__()
+        self.addCleanup(catcher.__exit__, None, None, None)
+        warnings.simplefilter("ignore", tessy.TessyWarning)
+
+        # The installed languages can't be determined without Tesseract
+        patcher = unittest.mock.patch.object(
+            _tessy, "_get_installed_langs", return_value=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        tessy.set_backend(tessy.Backend.CLI)
+        _tessy._lib_local.__dict__.clear()
+        _tessy._lib.clear()
+
+    def test_default_lang(self):
+        self.assertEqual(tessy.image_to_string(b"image"), "eng 300")
+        self.assertEqual(self.tess.langs, ["eng"])
+
+    def test_lang_list(self):
+        self.assertEqual(
+            tessy.image_to_string(b"image", lang=["eng", "deu"]), "eng+deu 300"
+        )
+
+    def test_dpi_not_kept(self):
+        self.assertEqual(tessy.image_to_string(b"image", config="--dpi 150"), "eng 150")
+        self.assertEqual(tessy.image_to_string(b"image"), "eng 300")
+
+
+class SplitPagesTest(unittest.TestCase):
+    def test_tsv(self):
+        data = "level\tpage_num\ttext\n1\t1\ta\n1\t2\tb"
+
+        self.assertEqual(
+            _tessy._split_pages(data, "tsv", 2),
+            ["level\tpage_num\ttext\n1\t1\ta", "level\tpage_num\ttext\n1\t1\tb"],
+        )
+
+    def test_malformed_tsv(self):
+        malformed = ("level\ttext\n1\ta", "level\tpage_num\n1\tx", "level\tpage_num\n1")
+
+        for data in malformed:
+            self.assertIsNone(_tessy._split_pages(data, "tsv", 1), data)
+
+    def test_box(self):
+        self.assertEqual(
+            _tessy._split_pages("a 1 2 3 4 0\nb 1 2 3 4 1", "box", 2),
+            ["a 1 2 3 4 0", "b 1 2 3 4 0"],
+        )
+
+    def test_malformed_box(self):
+        for data in ("a 1 2 3 4 0\n\nb 1 2 3 4 1", "a", "a 1 2 3 4 x"):
+            self.assertIsNone(_tessy._split_pages(data, "box", 2), data)
+
+    def test_hocr(self):
+        page = (
+            "<div class='ocr_page' id='page_{0}' title='bbox 0 0 9 9; ppageno {1}'>"
+            "<span class='ocrx_word' id='word_{0}_1'>w</span></div>\n"
+        )
+        data = "<body>\n{0}{1}</body>".format(page.format(1, 0), page.format(2, 1))
+        pages = _tessy._split_pages(data, "hocr", 2)
+
+        self.assertEqual(pages, ["<body>\n{0}</body>".format(page.format(1, 0))] * 2)
+
+
+@unittest.skipUnless(numpy, "NumPy is required")
+class CropTest(unittest.TestCase):
+    def crop(self, pixels):
+        return _tessy._preprocess_image(pixels, _tessy._parse_preprocess("crop"))
+
+    def test_dark_text(self):
+        pixels = numpy.full((200, 300), 255, numpy.uint8)
+        pixels[80:90, 50:250] = 0
+        cropped, config, transform = self.crop(pixels)
+
+        self.assertEqual(cropped.shape, (30, 220))
+        self.assertEqual(transform[0], (1.0, 0.0, 40.0, 0.0, 1.0, 70.0))
+
+    def test_light_text(self):
+        pixels = numpy.zeros((200, 300), numpy.uint8)
+        pixels[80:90, 50:250] = 255
+        cropped, config, transform = self.crop(pixels)
+
+        self.assertIsNotNone(cropped)
+        self.assertEqual(cropped.shape, (30, 220))
+
+    def test_blank(self):
+        for value in (0, 255):
+            cropped, config, transform = self.crop(
+                numpy.full((200, 300), value, numpy.uint8)
+            )
+
+            self.assertIsNone(cropped)
+
+
+if __name__ == "__main__":
+    unittest.main()